@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Optional ahead-of-time compilation of hot pure-Python modules with mypyc.
+The compiled extensions are written next to their sources in src/ and take
+precedence over the .py files on import; delete them to go back to plain Python.
+
+Usage (needs mypy installed):
+    python scripts/build_extensions.py
+"""
+
+import os
+import sys
+
+from setuptools import setup
+from mypyc.build import mypycify
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Small, fully annotated modules without dynamic tricks - safe for mypyc
+MODULES = ['square.py']
+
+
+def main() -> None:
+    """Build the extensions in place inside src/."""
+    os.chdir(SRC_DIR)
+    setup(
+        name='chess-extensions',
+        ext_modules=mypycify(MODULES, opt_level='3'),
+        script_args=['build_ext', '--inplace'] + sys.argv[1:],
+    )
+
+
+if __name__ == "__main__":
+    main()
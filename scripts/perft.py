@@ -4,6 +4,10 @@ Compares move generation with Stockfish's perft results to ensure the engine
 follows chess rules correctly and generates the exact same move counts.
 """
 
+import hashlib
+import multiprocessing
+import os
+import pickle
 import time
 from typing import Dict, List, Tuple, Optional
 from board import Board
@@ -13,6 +17,32 @@ from piece import Piece, Pawn, King, Queen, Rook, Bishop, Knight
 from fen import FEN
 from rules import Rules
 
+# Pickled boards of already parsed FEN strings (delete after changing the Board class)
+FEN_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+
+def load_or_cache_fen(fen: str, path: Optional[str] = None) -> Board:
+    """
+    Board for a FEN string, unpickled from the disk cache when the position was parsed
+    before and parsed (then cached) otherwise. Used by the perft drivers, which set up
+    the same positions over and over, including once per worker task.
+    """
+    if path is None:
+        path = os.path.join(FEN_CACHE_DIR, hashlib.sha1(fen.encode()).hexdigest() + '.pkl')
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    
+    board = Board()
+    FEN.load(board, fen)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write then rename so parallel workers never read a half-written file
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        pickle.dump(board, f, protocol=5)
+    os.replace(temp_path, path)
+    return board
+
 
 class PerftTest:
     """
@@ -99,13 +129,38 @@ class PerftTest:
         
         return sorted_results, total_nodes
     
+    def perft_divide_parallel(self, depth: int, board: Optional[Board] = None,
+                              processes: Optional[int] = None) -> Tuple[Dict[str, int], int]:
+        """
+        perft_divide with each root move's subtree counted in a multiprocessing.Pool worker.
+        Root subtrees are independent, so this scales with the number of cores.
+        Workers rebuild the position from its FEN and the root move's index.
+        """
+        if board is None:
+            board = self.board
+            
+        moves = self.generate_legal_moves(board)
+        if depth <= 1:
+            counts = [1] * len(moves)
+        else:
+            fen = FEN.get_fen(board)
+            # Forked workers inherit the imported modules and their precomputed tables
+            start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+            with multiprocessing.get_context(start_method).Pool(processes) as pool:
+                counts = pool.map(_divide_subtree, [(fen, index, depth - 1) for index in range(len(moves))])
+        
+        results = {self.move_to_algebraic(move): nodes for move, nodes in zip(moves, counts)}
+        return self.sort_moves_stockfish_order(results), sum(counts)
+    
     def generate_legal_moves(self, board: Board) -> List[Move]:
         """
         Generate all legal moves for the current player.
         This combines pseudo-legal move generation with legality checking
         to ensure no move leaves the king in check.
         """
-        pseudo_legal_moves = []
+        legal_moves = []
+        if board.king_sq[board.next_player] < 0:
+            return legal_moves  # No king to keep out of check
         
         # Get all pseudo-legal moves for the current player's pieces
         for row in range(8):
@@ -118,20 +173,11 @@ class PerftTest:
                     if isinstance(square.piece, Pawn):
                         piece_moves = self.expand_pawn_promotions(piece_moves, square.piece)
                     
-                    pseudo_legal_moves.extend(piece_moves)
-        
-        # Filter out moves that would leave the king in check
-        legal_moves = []
-        for move in pseudo_legal_moves:
-            board_copy = board.copy()
-            original_player = board_copy.next_player  # Store the player before making the move
-            self.make_move(board_copy, move)
-            
-            # Check if the move leaves the player's own king in check
-            king_pos = self.find_king(board_copy, original_player)
-            if king_pos and not self.is_square_attacked(board_copy, king_pos[0], king_pos[1], 
-                                                      'white' if original_player == 'black' else 'black'):
-                legal_moves.append(move)
+                    # Filter out moves that would leave the king in check. in_check plays the
+                    # move on the flat piece array only and restores it, so no board copy is needed
+                    for move in piece_moves:
+                        if not board.in_check(square.piece, move):
+                            legal_moves.append(move)
         
         return legal_moves
     
@@ -226,19 +272,22 @@ class PerftTest:
         sorted_moves = sorted(moves_dict.items(), key=lambda x: move_sort_key(x[0]))
         return dict(sorted_moves)
     
-    def run_test_position(self, fen: str, depth: int, description: str = "") -> int:
-        """Run perft test on a specific position."""
+    def run_test_position(self, fen: str, depth: int, description: str = "", parallel: bool = False) -> int:
+        """Run perft test on a specific position (root moves split across processes if parallel)."""
         print(f"\n{description}")
         print(f"Position: {fen}")
         print(f"Depth: {depth}")
         print()
         
         # Set up position
-        FEN.load(self.board, fen)
+        self.board = load_or_cache_fen(fen)
         
         # Run perft divide
         start_time = time.time()
-        results, total_nodes = self.perft_divide(depth)
+        if parallel:
+            results, total_nodes = self.perft_divide_parallel(depth)
+        else:
+            results, total_nodes = self.perft_divide(depth)
         end_time = time.time()
         
         # Print results in Stockfish format
@@ -250,7 +299,7 @@ class PerftTest:
         
         return total_nodes
     
-    def run_standard_tests(self) -> None:
+    def run_standard_tests(self, parallel: bool = True) -> None:
         """Run the standard perft test positions."""
         print("=== PERFT TEST SUITE ===")
         
@@ -258,45 +307,61 @@ class PerftTest:
         self.run_test_position(
             "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
             3,
-            "Starting position at depth 3:"
+            "Starting position at depth 3:",
+            parallel=parallel
         )
         
         # Test 2: En passant position
         self.run_test_position(
             "rnbqkbnr/pppp1ppp/8/4p3/3P4/8/PPP2PPP/RNBQKBNR b KQkq d3 0 2",
             3,
-            "En passant position at depth 3:"
+            "En passant position at depth 3:",
+            parallel=parallel
         )
         
         # Test 3: Castling rights
         self.run_test_position(
             "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1",
             3,
-            "Castling rights position at depth 3:"
+            "Castling rights position at depth 3:",
+            parallel=parallel
         )
         
         # Test 4: Pawn promotion
         self.run_test_position(
             "8/P7/8/8/8/8/7p/4k2K w - - 0 1",
             3,
-            "Pawn promotion position at depth 3:"
+            "Pawn promotion position at depth 3:",
+            parallel=parallel
         )
         
         # Test 5: Complex position
         self.run_test_position(
             "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
             3,
-            "Complex position (promotions, captures, castling, en passant, checks) at depth 3:"
+            "Complex position (promotions, captures, castling, en passant, checks) at depth 3:",
+            parallel=parallel
         )
         
         # Test 6: Complex position
         self.run_test_position(
             "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
             3,
-            "Complex Posisiton depth 5"
+            "Complex Posisiton depth 5",
+            parallel=parallel
         )
 
 
+def _divide_subtree(task: Tuple[str, int, int]) -> int:
+    """Pool task of perft_divide_parallel: perft below one root move, given as (fen, move index, depth)."""
+    fen, index, depth = task
+    test = PerftTest()
+    board = load_or_cache_fen(fen)
+    board_copy = board.copy()
+    test.make_move(board_copy, test.generate_legal_moves(board)[index])
+    return test.perft(depth, board_copy)
+
+
 def perft(board_or_depth, next_player_or_fen=None, depth_or_none=None):
     """
     Convenience function for running perft on a position.
@@ -315,7 +380,7 @@ def perft(board_or_depth, next_player_or_fen=None, depth_or_none=None):
         depth = board_or_depth
         fen = next_player_or_fen or "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
         test = PerftTest()
-        FEN.load(test.board, fen)
+        test.board = load_or_cache_fen(fen)
         return test.perft(depth)
     else:
         # Legacy style: perft(board, next_player, depth)
@@ -333,21 +398,24 @@ def perft(board_or_depth, next_player_or_fen=None, depth_or_none=None):
             test.board.halfmove_clock = board.halfmove_clock
             test.board.fullmove_number = board.fullmove_number
             test.board.last_move = board.last_move
+            test.board.sync_piece_arr()
             return test.perft(depth)
         else:
             raise ValueError("Invalid arguments for perft function")
 
 
-def perft_divide(depth: int, fen: str = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1") -> None:
+def perft_divide(depth: int, fen: str = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+                 parallel: bool = False) -> None:
     """
     Convenience function for running perft divide on a position.
     
     Args:
         depth: Search depth
         fen: FEN string of position (default: starting position)
+        parallel: Count each root move's subtree in a separate worker process
     """
     test = PerftTest()
-    test.run_test_position(fen, depth)
+    test.run_test_position(fen, depth, parallel=parallel)
 
 
 if __name__ == "__main__":
@@ -7,7 +7,7 @@ import sys
 import time
 import argparse
 from typing import Dict, List, Optional
-from perft import PerftTest
+from perft import PerftTest, load_or_cache_fen
 from perft_results import PERFT_POSITIONS, run_perft_verification, print_perft_summary
 
 def run_position_test(position_name: str, depth: int = 3, show_divide: bool = False):
@@ -31,8 +31,7 @@ def run_position_test(position_name: str, depth: int = 3, show_divide: bool = Fa
     
     try:
         # Load the position
-        from fen import FEN
-        FEN.load(test.board, fen)
+        test.board = load_or_cache_fen(fen)
         
         # Run perft divide if requested or just perft
         if show_divide:
@@ -130,8 +129,7 @@ def run_test_suite(max_depth: int = 3, positions: Optional[List[str]] = None):
             test = PerftTest()
             
             try:
-                from fen import FEN
-                FEN.load(test.board, position_data["fen"])
+                test.board = load_or_cache_fen(position_data["fen"])
                 actual_nodes = test.perft(depth)
                 end_time = time.time()
                 
@@ -193,8 +191,7 @@ def run_benchmark(position_name: str = "starting_position", depth: int = 5):
     print()
     
     test = PerftTest()
-    from fen import FEN
-    FEN.load(test.board, position_data["fen"])
+    test.board = load_or_cache_fen(position_data["fen"])
     
     # Warm up
     test.perft(1)
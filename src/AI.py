@@ -15,9 +15,10 @@ class AI:
     Supports multiple difficulty levels and playing styles.
     """
     
-    def __init__(self, color: Optional[str], difficulty: str = "medium"):
+    def __init__(self, color: Optional[str], difficulty: str = "medium", workers: int = 1):
         self.color = color
         self.difficulty = difficulty
+        self.workers = workers  # Search processes (lazy SMP when > 1)
         self.search_engine = Search()
         self.opening_book = OpeningBook()
         
@@ -77,7 +78,7 @@ class AI:
                     pass
         
         # Fall back to search if no book move
-        result = self.search_engine.search(board, self.depth, self.time_limit)
+        result = self.search_engine.search_parallel(board, self.depth, self.time_limit, self.workers)
         
         if result.best_move:
             # Find the piece to move
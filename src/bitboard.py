@@ -0,0 +1,156 @@
+"""
+Bitboard helpers for the board's per-piece bitboards.
+Bit n stands for square n = row * 8 + col (row 0 is the 8th rank), matching
+the flat piece array. Attack tables are precomputed once at import.
+"""
+
+from typing import Iterator, List, Tuple
+from piece import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+
+
+def _step_table(offsets: Tuple[Tuple[int, int], ...]) -> Tuple[int, ...]:
+    """Bitboard of the squares reached by one step along each offset, per square."""
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, 8)
+        bb = 0
+        for dr, dc in offsets:
+            r, c = row + dr, col + dc
+            if 0 <= r < 8 and 0 <= c < 8:
+                bb |= 1 << (r * 8 + c)
+        table.append(bb)
+    return tuple(table)
+
+
+def _ray_table(dr: int, dc: int) -> Tuple[int, ...]:
+    """Bitboard of every square along one direction (excluding the start square), per square."""
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, 8)
+        bb = 0
+        r, c = row + dr, col + dc
+        while 0 <= r < 8 and 0 <= c < 8:
+            bb |= 1 << (r * 8 + c)
+            r += dr
+            c += dc
+        table.append(bb)
+    return tuple(table)
+
+
+KNIGHT_ATTACKS = _step_table(((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)))
+KING_ATTACKS = _step_table(((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)))
+
+# Squares attacked by a pawn standing on a square, indexed by color (0 = white moves up, 1 = black)
+PAWN_ATTACKS = (_step_table(((-1, -1), (-1, 1))), _step_table(((1, -1), (1, 1))))
+
+# Squares from which a pawn of the given color attacks a square - the mirror of PAWN_ATTACKS
+PAWN_ATTACKERS_OF = (PAWN_ATTACKS[1], PAWN_ATTACKS[0])
+
+# Sets of piece types (bit 1 << piece type) for selecting attackers
+ALL_PIECE_TYPES = (1 << 6) - 1
+SLIDERS = (1 << BISHOP) | (1 << ROOK) | (1 << QUEEN)
+
+# (ray table, direction increases the square index) per slider direction
+_ROOK_RAYS = tuple((_ray_table(dr, dc), dr * 8 + dc > 0) for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)))
+_BISHOP_RAYS = tuple((_ray_table(dr, dc), dr * 8 + dc > 0) for dr, dc in ((-1, -1), (-1, 1), (1, -1), (1, 1)))
+
+
+def _ray_attacks(sq: int, occupied: int, rays) -> int:
+    """Classical ray attacks: each ray is cut behind its first blocker."""
+    attacks = 0
+    for ray_table, increasing in rays:
+        ray = ray_table[sq]
+        blockers = ray & occupied
+        if blockers:
+            # Nearest blocker is the lowest bit on increasing rays, the highest otherwise
+            blocker_sq = ((blockers & -blockers) if increasing else blockers).bit_length() - 1
+            ray ^= ray_table[blocker_sq]
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks(sq: int, occupied: int) -> int:
+    """Squares a rook on sq attacks given the occupied squares."""
+    return _ray_attacks(sq, occupied, _ROOK_RAYS)
+
+
+def bishop_attacks(sq: int, occupied: int) -> int:
+    """Squares a bishop on sq attacks given the occupied squares."""
+    return _ray_attacks(sq, occupied, _BISHOP_RAYS)
+
+
+def is_attacked(pieces: List[int], side: int, sq: int, occupied: int) -> bool:
+    """
+    True when any of one side's pieces attacks square sq.
+    pieces are that side's bitboards indexed by piece type, side is 0 for white.
+    """
+    if (pieces[PAWN] & PAWN_ATTACKERS_OF[side][sq] or pieces[KNIGHT] & KNIGHT_ATTACKS[sq]
+            or pieces[KING] & KING_ATTACKS[sq]):
+        return True
+    queens = pieces[QUEEN]
+    if (pieces[BISHOP] | queens) & bishop_attacks(sq, occupied):
+        return True
+    return bool((pieces[ROOK] | queens) & rook_attacks(sq, occupied))
+
+
+def iter_bits(bb: int) -> Iterator[int]:
+    """Yield the square index of every set bit, lowest first."""
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+# Square lists for walking the flat piece array (mailbox) instead of a bitboard
+KNIGHT_SQUARES = tuple(tuple(iter_bits(bb)) for bb in KNIGHT_ATTACKS)
+KING_SQUARES = tuple(tuple(iter_bits(bb)) for bb in KING_ATTACKS)
+PAWN_ATTACKER_SQUARES = tuple(tuple(tuple(iter_bits(bb)) for bb in table) for table in PAWN_ATTACKERS_OF)
+
+
+def _ray_squares(directions: Tuple[Tuple[int, int], ...]) -> Tuple[Tuple[Tuple[int, ...], ...], ...]:
+    """Per square, the squares along each direction ordered outwards (empty rays dropped)."""
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, 8)
+        rays = []
+        for dr, dc in directions:
+            ray = []
+            r, c = row + dr, col + dc
+            while 0 <= r < 8 and 0 <= c < 8:
+                ray.append(r * 8 + c)
+                r += dr
+                c += dc
+            if ray:
+                rays.append(tuple(ray))
+        table.append(tuple(rays))
+    return tuple(table)
+
+
+ROOK_RAY_SQUARES = _ray_squares(((-1, 0), (1, 0), (0, -1), (0, 1)))
+BISHOP_RAY_SQUARES = _ray_squares(((-1, -1), (-1, 1), (1, -1), (1, 1)))
+
+
+def _between_table() -> Tuple[Tuple[int, ...], ...]:
+    """BETWEEN[a][b]: squares strictly between a and b on a shared line or diagonal, else 0."""
+    table = []
+    for a in range(64):
+        row_a, col_a = divmod(a, 8)
+        masks = []
+        for b in range(64):
+            row_b, col_b = divmod(b, 8)
+            dr, dc = row_b - row_a, col_b - col_a
+            mask = 0
+            if a != b and (dr == 0 or dc == 0 or abs(dr) == abs(dc)):
+                step_r = (dr > 0) - (dr < 0)
+                step_c = (dc > 0) - (dc < 0)
+                r, c = row_a + step_r, col_a + step_c
+                while r != row_b or c != col_b:
+                    mask |= 1 << (r * 8 + c)
+                    r += step_r
+                    c += step_c
+            masks.append(mask)
+        table.append(tuple(masks))
+    return tuple(table)
+
+
+BETWEEN = _between_table()
@@ -1,10 +1,19 @@
-from typing import Optional, List, Tuple, Dict
-from piece import Piece, Pawn, King, Queen, Rook, Bishop, Knight
-from const import ROWS, COLS
-from square import Square
+from array import array
+from typing import Optional, List, Tuple, Dict, Iterator
+from piece import (Piece, Pawn, King, Queen, Rook, Bishop, Knight, piece_code, MATERIAL_POINTS, PROMOTION_CODES,
+                   PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING)
+from const import ROWS, COLS, CHECK_CACHE_SIZE
+from square import Square, ALPHACOLS, EMPTY_SQUARES, SQUARE_COORDS
 from move import Move
 from fen import FEN
 from move_info import MoveInfo
+from zobrist import ZOBRIST_KEYS, ZOBRIST_BLACK_TO_MOVE
+from bitboard import (KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKERS_OF, ALL_PIECE_TYPES, bishop_attacks, rook_attacks,
+                      iter_bits, is_attacked, KNIGHT_SQUARES, KING_SQUARES, PAWN_ATTACKER_SQUARES, ROOK_RAY_SQUARES,
+                      BISHOP_RAY_SQUARES)
+
+# Piece class a pawn turns into for each promotion letter
+PROMOTION_PIECES = {'q': Queen, 'r': Rook, 'b': Bishop, 'n': Knight}
 
 class Board:
     """
@@ -13,6 +22,7 @@ class Board:
     Handles the core game logic for making moves and updating board state.
     """
     squares: List[List[Square]]
+    piece_arr: array
     last_move: Optional[Move]
     halfmove_clock: int
     next_player: str
@@ -22,6 +32,14 @@ class Board:
 
     def __init__(self):
         self.squares: List[List[Square]] = []
+        self.piece_arr: array = array('b', bytes(64))  # Signed piece codes indexed by row * 8 + col
+        self._check_cache: Dict[Tuple[bytes, str], bool] = {}  # in_check_king results keyed by position
+        self.king_sq: Dict[str, int] = {'white': -1, 'black': -1}  # row * 8 + col of each king (-1 = none)
+        self.zobrist: int = 0  # Zobrist hash of the piece placement, kept in step with piece_arr
+        self.position_history: List[int] = []  # Position keys (placement + side to move) since the game start
+        self.bb: List[List[int]] = [[0] * 6, [0] * 6]  # Bitboards by color index (0 = white) and piece type (PAWN ... KING)
+        self.occupancy: List[int] = [0, 0]  # Bitboards of all white / all black pieces
+        self.material: List[int] = [0, 0]  # White / black material points (1/3/3/5/9, kings excluded)
         self.last_move: Optional[Move] = None
         self.halfmove_clock: int = 0
         self.fullmove_number: int = 1
@@ -63,6 +81,9 @@ class Board:
         if self.next_player == 'black':
             self.fullmove_number += 1
 
+        self.sync_piece_arr()
+        self.position_history.append(self.zobrist ^ (ZOBRIST_BLACK_TO_MOVE if piece.color == 'white' else 0))
+
     def _handle_en_passant(self, piece: Piece, initial: Square, final: Square) -> None:
         """
         Handle en passant logic - both setting the target square for two-square pawn moves
@@ -71,7 +92,7 @@ class Board:
         if isinstance(piece, Pawn):
             # Set en passant target square when pawn moves two squares from starting position
             if abs(final.row - initial.row) == 2:
-                col_letter = Square.ALPHACOLS[initial.col]
+                col_letter = ALPHACOLS[initial.col]
                 # Calculate the square the pawn "jumped over" - this becomes the en passant target
                 en_passant_row = (initial.row + final.row) // 2
                 row_num = str(8 - en_passant_row)  # Convert array index to chess rank notation
@@ -141,94 +162,103 @@ class Board:
     def in_check(self, piece: Piece, move: Move) -> bool:
         """
         Test if making a move would leave the moving player's king in check.
-        Temporarily makes the move on the board, checks for check, then undoes it.
+        Temporarily makes the move on the flat piece array, checks for check, then undoes it.
         Special handling for castling to ensure king doesn't pass through check.
         """
-        initial_square = self.squares[move.initial.row][move.initial.col]
-        final_square = self.squares[move.final.row][move.final.col]
-        captured_piece = final_square.piece
+        piece_arr = self.piece_arr
+        origin = move.initial.row * 8 + move.initial.col
+        target = move.final.row * 8 + move.final.col
+        code = piece_arr[origin]
+        captured_code = piece_arr[target]
 
         # Detect en passant capture (diagonal pawn move to empty square)
-        en_passant = (
-            isinstance(piece, Pawn) and
-            abs(move.final.col - move.initial.col) == 1 and
-            initial_square.row != move.final.row and
-            final_square.is_empty
-        )
-
-        # Handle en passant capture setup
-        captured_en_passant: Optional[Piece] = None
-        if en_passant:
-            captured_square = self.squares[move.initial.row][move.final.col]
-            captured_en_passant = captured_square.piece
-            captured_square.piece = None
+        en_passant_index = -1
+        if isinstance(piece, Pawn) and move.final.col != move.initial.col and not captured_code:
+            en_passant_index = move.initial.row * 8 + move.final.col
+            en_passant_code = piece_arr[en_passant_index]
+            piece_arr[en_passant_index] = 0
 
         # Temporarily make the move
-        final_square.piece = piece
-        initial_square.piece = None
+        piece_arr[target] = code
+        piece_arr[origin] = 0
 
-        # Special castling check - king cannot pass through attacked squares
+        king_in_check = False
         if isinstance(piece, King) and abs(move.final.col - move.initial.col) == 2:
-            step = 1 if move.final.col > move.initial.col else -1
-            # Check each square the king passes through during castling
-            for intermediate_col in range(move.initial.col, move.final.col + step, step):
-                temp_square = self.squares[move.initial.row][intermediate_col]
-                original_piece = temp_square.piece
-                temp_square.piece = piece
-
-                if self.in_check_king(piece.color):
-                    # King would be in check during castling - restore and reject
-                    temp_square.piece = original_piece
-                    initial_square.piece = piece
-                    final_square.piece = captured_piece
-                    if en_passant:
-                        captured_square.piece = captured_en_passant
-                    return True
-
-                temp_square.piece = original_piece
-
-            # Restore board state after castling check
-            initial_square.piece = piece
-            final_square.piece = captured_piece
-            if en_passant:
-                captured_square.piece = captured_en_passant
-            return False
-
-        # Check if king is in check after the move
-        king_in_check = self.in_check_king(piece.color)
+            # Special castling check - king cannot pass through attacked squares
+            step = 1 if target > origin else -1
+            for index in range(origin, target + step, step):
+                original_code = piece_arr[index]
+                piece_arr[index] = code
+                king_in_check = self._scan_check(piece.color, index)
+                piece_arr[index] = original_code
+                if king_in_check:
+                    break
+        else:
+            # Check if king is in check after the move
+            king_in_check = self._scan_check(piece.color, target if isinstance(piece, King) else None)
 
-        # Restore the board to original state
-        initial_square.piece = piece
-        final_square.piece = captured_piece
-        if en_passant:
-            captured_square.piece = captured_en_passant
+        # Restore the piece array to its original state
+        piece_arr[origin] = code
+        piece_arr[target] = captured_code
+        if en_passant_index >= 0:
+            piece_arr[en_passant_index] = en_passant_code
 
         return king_in_check
 
     def in_check_king(self, color: str) -> bool:
         """
         Check if the king of the specified color is currently in check.
-        Searches the board for the king and tests if any enemy piece can attack it.
+        Results are cached per piece placement, so the search can ask the same
+        question about a position several times for the price of one scan.
         """
-        # First, find the king's position
-        king_row, king_col = -1, -1
-        for row in range(ROWS):
-            for col in range(COLS):
-                square = self.squares[row][col]
-                if square.has_piece and square.piece and square.piece.name == 'king' and square.piece.color == color:
-                    king_row, king_col = row, col
+        key = (self.piece_arr.tobytes(), color)
+        cached = self._check_cache.get(key)
+        if cached is None:
+            if len(self._check_cache) >= CHECK_CACHE_SIZE:
+                self._check_cache.clear()
+            cached = self._check_cache[key] = self._scan_check(color)
+        return cached
+
+    def _scan_check(self, color: str, king_index: Optional[int] = None) -> bool:
+        """
+        Uncached check test: looks outwards from the king over the flat piece array
+        for enemy pawns, knights, kings and sliders. Used directly while in_check
+        patches the array - pass king_index when the king itself was moved.
+        """
+        if king_index is None:
+            king_index = self.king_sq[color]
+        if king_index < 0:
+            return False  # No king of this color on the board
+        piece_arr = self.piece_arr
+        enemy_side = 1 if color == 'white' else 0
+        sign = -1 if enemy_side else 1  # Sign of the enemy piece codes
+
+        pawn, knight, bishop, rook, queen, king = (sign * code for code in range(1, 7))
+        for index in PAWN_ATTACKER_SQUARES[enemy_side][king_index]:
+            if piece_arr[index] == pawn:
+                return True
+        for index in KNIGHT_SQUARES[king_index]:
+            if piece_arr[index] == knight:
+                return True
+        for index in KING_SQUARES[king_index]:
+            if piece_arr[index] == king:
+                return True
 
-        # Then, check if any enemy piece can reach the king's square
-        for row in range(ROWS):
-            for col in range(COLS):
-                square = self.squares[row][col]
-                if square.has_enemy_piece(color):
-                    enemy_piece = square.piece
-                    if enemy_piece:
-                        self.calc_moves(enemy_piece, row, col, filter_checks=False)
-                        for move in enemy_piece.moves:
-                            if move.final.row == king_row and move.final.col == king_col:
-                                return True
+        # Sliders: the first piece met along each line decides
+        for ray in ROOK_RAY_SQUARES[king_index]:
+            for index in ray:
+                code = piece_arr[index]
+                if code:
+                    if code == rook or code == queen:
+                        return True
+                    break
+        for ray in BISHOP_RAY_SQUARES[king_index]:
+            for index in ray:
+                code = piece_arr[index]
+                if code:
+                    if code == bishop or code == queen:
+                        return True
+                    break
         return False
 
     def is_checkmate(self, color: str) -> bool:
@@ -242,20 +272,16 @@ class Board:
         return not self.player_has_moves(color)
     
     def is_dead_position(self) -> bool:
-        pieces: List[Piece] = []
-        for row in self.squares:
-            for square in row:
-                if square.has_piece and square.piece:
-                    pieces.append(square.piece)
-        if len(pieces) == 2:
+        codes = [code for code in self.piece_arr if code]
+        if len(codes) == 2:
             return True
-        if len(pieces) == 3:
-            piece_names = [p.name for p in pieces if p.name != 'king']
-            if 'bishop' in piece_names or 'knight' in piece_names:
+        if len(codes) == 3:
+            # King and a minor piece against a bare king
+            if any(abs(code) == 2 or abs(code) == 3 for code in codes):
                 return True
-        if len(pieces) == 4:
-            bishops = [p for p in pieces if p.name == 'bishop']
-            if len(bishops) == 2 and bishops[0].color != bishops[1].color:
+        if len(codes) == 4:
+            bishops = [code for code in codes if abs(code) == 3]
+            if len(bishops) == 2 and bishops[0] != bishops[1]:
                 return True
         return False
     
@@ -263,13 +289,12 @@ class Board:
         return self.halfmove_clock >= 100
 
     def player_has_moves(self, color: str) -> bool:
-        for row in range(ROWS):
-            for col in range(COLS):
-                square = self.squares[row][col]
-                if square.has_piece and square.piece and square.piece.color == color:
-                    self.calc_moves(square.piece, row, col, filter_checks=True)
-                    if square.piece.moves:
-                        return True
+        for index in iter_bits(self.occupancy[0 if color == 'white' else 1]):
+            row, col = SQUARE_COORDS[index]
+            piece = self.squares[row][col].piece
+            self.calc_moves(piece, row, col, filter_checks=True)
+            if piece.moves:
+                return True
         return False
 
     def calc_moves(self, piece: Piece, row: int, col: int, filter_checks: bool=True) -> None:
@@ -292,6 +317,73 @@ class Board:
         # Add starting pieces for both sides
         self._add_pieces('white')
         self._add_pieces('black')
+        self.sync_piece_arr()
+        self.reset_position_history()
+
+    def sync_piece_arr(self) -> None:
+        """
+        Rebuild the flat piece array, bitboards, material, king squares and Zobrist hash from the squares.
+        Needed after the board is set up without make_move_fast (FEN loading, GUI moves).
+        """
+        piece_arr = self.piece_arr
+        self.king_sq = {'white': -1, 'black': -1}
+        self.bb = [[0] * 6, [0] * 6]
+        self.occupancy = [0, 0]
+        self.material = [0, 0]
+        zobrist = 0
+        for row in range(ROWS):
+            for col in range(COLS):
+                index = row * 8 + col
+                code = piece_arr[index] = piece_code(self.squares[row][col].piece)
+                zobrist ^= ZOBRIST_KEYS[(code + 6) * 64 + index]
+                if code:
+                    side = code < 0
+                    self.bb[side][abs(code) - 1] |= 1 << index
+                    self.occupancy[side] |= 1 << index
+                    self.material[side] += MATERIAL_POINTS[abs(code)]
+                if code == 6:
+                    self.king_sq['white'] = index
+                elif code == -6:
+                    self.king_sq['black'] = index
+        self.zobrist = zobrist
+
+    def _set_code(self, index: int, code: int) -> None:
+        """Write a piece code to the flat piece array, updating the bitboards, material and Zobrist hash."""
+        old = self.piece_arr[index]
+        self.zobrist ^= ZOBRIST_KEYS[(old + 6) * 64 + index] ^ ZOBRIST_KEYS[(code + 6) * 64 + index]
+        bit = 1 << index
+        if old:
+            side = old < 0
+            self.bb[side][abs(old) - 1] ^= bit
+            self.occupancy[side] ^= bit
+            self.material[side] -= MATERIAL_POINTS[abs(old)]
+        if code:
+            side = code < 0
+            self.bb[side][abs(code) - 1] |= bit
+            self.occupancy[side] |= bit
+            self.material[side] += MATERIAL_POINTS[abs(code)]
+        self.piece_arr[index] = code
+
+    def position_key(self) -> int:
+        """Zobrist key of the current position including the side to move."""
+        return self.zobrist ^ (ZOBRIST_BLACK_TO_MOVE if self.next_player == 'black' else 0)
+
+    def reset_position_history(self) -> None:
+        """Start the repetition history from the current position (new game or FEN load)."""
+        self.position_history = [self.position_key()]
+
+    def is_repetition(self) -> bool:
+        """
+        Check if the current position already occurred since the last pawn move
+        or capture. The search scores any repetition as a draw.
+        """
+        history = self.position_history
+        return history[-1] in history[-self.halfmove_clock - 1:-1]
+
+    def is_threefold_repetition(self) -> bool:
+        """Check if the current position has occurred three times (draw by repetition)."""
+        history = self.position_history
+        return history[-self.halfmove_clock - 1:].count(history[-1]) >= 3
 
     def _add_pieces(self, color: str) -> None:
         """
@@ -311,7 +403,6 @@ class Board:
 
     def set_fen(self, fen: str) -> None:
         """Load a position from FEN notation."""
-        from fen import FEN
         FEN.load(self, fen)
 
     def update_castling_rights(self, piece: Piece, initial: Square, final: Square) -> None:
@@ -381,6 +472,14 @@ class Board:
                         new_piece.value = original_piece.value
                         new_board.squares[row][col].piece = new_piece
         
+        new_board.piece_arr = array('b', self.piece_arr)
+        new_board.king_sq = dict(self.king_sq)
+        new_board.zobrist = self.zobrist
+        new_board.bb = [list(self.bb[0]), list(self.bb[1])]
+        new_board.occupancy = list(self.occupancy)
+        new_board.material = list(self.material)
+        new_board.position_history = list(self.position_history)
+        
         # Copy game state
         new_board.last_move = self.last_move
         new_board.halfmove_clock = self.halfmove_clock
@@ -405,8 +504,6 @@ class Board:
         Returns:
             MoveInfo object containing undo information
         """
-        from move_info import MoveInfo
-        
         move_info = MoveInfo()
         initial = move.initial
         final = move.final
@@ -444,6 +541,7 @@ class Board:
             
             # Remove the en passant captured pawn
             captured_square.piece = None
+            self._set_code(capture_row * 8 + capture_col, 0)
         
         # Handle castling
         if (piece.name == 'king' and abs(final.col - initial.col) == 2):
@@ -466,6 +564,9 @@ class Board:
             move_info.rook_was_moved = rook.moved if rook else False  # Store rook's original status
             self.squares[move_info.rook_final_row][move_info.rook_final_col].piece = rook
             self.squares[move_info.rook_initial_row][move_info.rook_initial_col].piece = None
+            rook_initial_sq = move_info.rook_initial_row * 8 + move_info.rook_initial_col
+            self._set_code(move_info.rook_final_row * 8 + move_info.rook_final_col, self.piece_arr[rook_initial_sq])
+            self._set_code(rook_initial_sq, 0)
             if rook:
                 rook.moved = True
         
@@ -475,16 +576,18 @@ class Board:
             move_info.promoted_from_piece = piece
             
             # Create promoted piece
-            from piece import Queen, Rook, Bishop, Knight
-            promotion_pieces = {'q': Queen, 'r': Rook, 'b': Bishop, 'n': Knight}
-            if move.promotion in promotion_pieces:
-                promoted_piece = promotion_pieces[move.promotion](piece.color)
+            if move.promotion in PROMOTION_PIECES:
+                promoted_piece = PROMOTION_PIECES[move.promotion](piece.color)
                 promoted_piece.moved = True
                 piece = promoted_piece
         
         # Make the main move
         self.squares[initial.row][initial.col].piece = None
         self.squares[final.row][final.col].piece = piece
+        self._set_code(initial.row * 8 + initial.col, 0)
+        self._set_code(final.row * 8 + final.col, piece_code(piece))
+        if piece.name == 'king':
+            self.king_sq[piece.color] = final.row * 8 + final.col
         piece.moved = True
         
         # Update game state
@@ -513,6 +616,9 @@ class Board:
         # Switch players
         self.next_player = 'black' if self.next_player == 'white' else 'white'
         
+        # Record the new position for repetition detection
+        self.position_history.append(self.zobrist ^ (ZOBRIST_BLACK_TO_MOVE if self.next_player == 'black' else 0))
+        
         return move_info
     
     def unmake_move_fast(self, piece: Piece, move: Move, move_info: 'MoveInfo') -> None:
@@ -527,6 +633,8 @@ class Board:
         initial = move.initial
         final = move.final
         
+        self.position_history.pop()
+        
         # Restore game state
         self.castling_rights = move_info.prev_castling_rights
         self.en_passant = move_info.prev_en_passant
@@ -544,6 +652,10 @@ class Board:
         # Undo the main move
         self.squares[initial.row][initial.col].piece = piece
         self.squares[final.row][final.col].piece = move_info.captured_piece
+        self._set_code(initial.row * 8 + initial.col, piece_code(piece))
+        self._set_code(final.row * 8 + final.col, piece_code(move_info.captured_piece))
+        if piece.name == 'king':
+            self.king_sq[piece.color] = initial.row * 8 + initial.col
         
         # Undo castling
         if move_info.is_castling:
@@ -551,12 +663,16 @@ class Board:
             rook = self.squares[move_info.rook_final_row][move_info.rook_final_col].piece
             self.squares[move_info.rook_initial_row][move_info.rook_initial_col].piece = rook
             self.squares[move_info.rook_final_row][move_info.rook_final_col].piece = None
+            rook_final_sq = move_info.rook_final_row * 8 + move_info.rook_final_col
+            self._set_code(move_info.rook_initial_row * 8 + move_info.rook_initial_col, self.piece_arr[rook_final_sq])
+            self._set_code(rook_final_sq, 0)
             if rook:
                 rook.moved = move_info.rook_was_moved  # Restore rook's original moved status
         
         # Undo en passant capture
         if move_info.en_passant_capture:
             self.squares[move_info.en_passant_capture_row][move_info.en_passant_capture_col].piece = move_info.en_passant_captured_piece
+            self._set_code(move_info.en_passant_capture_row * 8 + move_info.en_passant_capture_col, piece_code(move_info.en_passant_captured_piece))
         
         # Restore game state
         self.next_player = move_info.prev_next_player
@@ -574,30 +690,132 @@ class Board:
         Returns list of (piece, move) tuples for AI move generation.
         """
         all_moves = []
-        for row in range(ROWS):
-            for col in range(COLS):
-                square = self.squares[row][col]
-                if square.has_piece and square.piece and square.piece.color == color:
-                    piece = square.piece
-                    self.calc_moves(piece, row, col, filter_checks=True)
-                    for move in piece.moves:
-                        all_moves.append((piece, move))
+        # Walk the side's occupancy bitboard - ascending squares keep the row-major order
+        for index in iter_bits(self.occupancy[0 if color == 'white' else 1]):
+            row, col = SQUARE_COORDS[index]
+            piece = self.squares[row][col].piece
+            self.calc_moves(piece, row, col, filter_checks=True)
+            for move in piece.moves:
+                all_moves.append((piece, move))
         return all_moves
 
+    def attackers(self, sq: int, color: str, types: int = ALL_PIECE_TYPES) -> int:
+        """
+        Bitboard of the pieces of one color attacking square sq (row * 8 + col).
+        types is a set of piece types (bits 1 << PAWN ... 1 << KING) to consider,
+        e.g. bitboard.SLIDERS for bishops, rooks and queens only.
+        """
+        side = 0 if color == 'white' else 1
+        pieces = self.bb[side]
+        occupied = self.occupancy[0] | self.occupancy[1]
+        found = 0
+        if types & (1 << PAWN):
+            found |= pieces[PAWN] & PAWN_ATTACKERS_OF[side][sq]
+        if types & (1 << KNIGHT):
+            found |= pieces[KNIGHT] & KNIGHT_ATTACKS[sq]
+        if types & (1 << KING):
+            found |= pieces[KING] & KING_ATTACKS[sq]
+        diagonal = pieces[BISHOP] * (types >> BISHOP & 1) | pieces[QUEEN] * (types >> QUEEN & 1)
+        if diagonal:
+            found |= diagonal & bishop_attacks(sq, occupied)
+        straight = pieces[ROOK] * (types >> ROOK & 1) | pieces[QUEEN] * (types >> QUEEN & 1)
+        if straight:
+            found |= straight & rook_attacks(sq, occupied)
+        return found
+
+    def move_gives_check(self, piece: Piece, move: Move) -> bool:
+        """
+        Static check test covering direct, discovered, castling and en passant checks.
+        Builds the mover's bitboards after the move and asks whether they attack
+        the enemy king - the board itself is never modified.
+        """
+        side = piece.color_idx
+        king_index = self.king_sq['black' if side == 0 else 'white']
+        if king_index < 0:
+            return False
+        origin = move.initial.row * 8 + move.initial.col
+        target = move.final.row * 8 + move.final.col
+        from_bit = 1 << origin
+        to_bit = 1 << target
+
+        pieces = [bb & ~from_bit for bb in self.bb[side]]
+        occupied = ((self.occupancy[0] | self.occupancy[1]) & ~from_bit) | to_bit
+        code = piece.code
+        if move.promotion:
+            code = PROMOTION_CODES[move.promotion]
+        elif code == PAWN and move.initial.col != move.final.col and not self.piece_arr[target]:
+            occupied &= ~(1 << (move.initial.row * 8 + move.final.col))  # En passant removes the passed pawn
+        elif code == KING and abs(move.final.col - move.initial.col) == 2:
+            # Castling also moves the rook next to the king
+            rook_from, rook_to = (target + 1, target - 1) if move.final.col == 6 else (target - 2, target + 1)
+            pieces[ROOK] = (pieces[ROOK] & ~(1 << rook_from)) | (1 << rook_to)
+            occupied = (occupied & ~(1 << rook_from)) | (1 << rook_to)
+        pieces[code] |= to_bit
+        return is_attacked(pieces, side, king_index, occupied)
+
+    def generate_captures(self, color: str) -> Iterator[Tuple[Piece, Move]]:
+        """
+        Yield the legal captures for a given color (including en passant) as
+        (piece, move) tuples without generating any quiet moves.
+        """
+        return self._generate_forcing(color, False)
+
+    def generate_tactical(self, color: str) -> Iterator[Tuple[Piece, Move]]:
+        """
+        Yield the legal captures and promotions for a given color.
+        Checks are not included - they need the quiet moves generated.
+        """
+        return self._generate_forcing(color, True)
+
+    def _generate_forcing(self, color: str, promotions: bool) -> Iterator[Tuple[Piece, Move]]:
+        """
+        Shared generator for generate_captures / generate_tactical.
+        Non-pawn targets come from the enemy occupancy bitboard; pawns reuse their
+        own move generation since captures there depend on en passant state.
+        """
+        side = 0 if color == 'white' else 1
+        enemy = self.occupancy[1 - side]
+        occupied = self.occupancy[0] | self.occupancy[1]
+        piece_arr = self.piece_arr
+        squares = self.squares
+        for index in iter_bits(self.occupancy[side]):
+            row, col = SQUARE_COORDS[index]
+            piece = squares[row][col].piece
+            code = abs(piece_arr[index])
+            if code == 1:
+                for move in piece.get_moves(row, col, self):
+                    if move.final.col != col or (promotions and move.promotion):
+                        if not self.in_check(piece, move):
+                            yield piece, move
+                continue
+            if code == 2:
+                targets = KNIGHT_ATTACKS[index]
+            elif code == 3:
+                targets = bishop_attacks(index, occupied)
+            elif code == 4:
+                targets = rook_attacks(index, occupied)
+            elif code == 5:
+                targets = bishop_attacks(index, occupied) | rook_attacks(index, occupied)
+            else:
+                targets = KING_ATTACKS[index]
+            for target in iter_bits(targets & enemy):
+                captured = squares[target >> 3][target & 7].piece
+                move = Move(EMPTY_SQUARES[row][col], Square(target >> 3, target & 7, captured), captured=captured)
+                if not self.in_check(piece, move):
+                    yield piece, move
+
     def get_piece_positions(self, color: str) -> dict[str, list[tuple[int, int]]]:
         """
         Get positions of all pieces for a given color.
         Returns dict mapping piece names to list of (row, col) positions.
         """
         positions = {}
-        for row in range(ROWS):
-            for col in range(COLS):
-                square = self.squares[row][col]
-                if square.has_piece and square.piece and square.piece.color == color:
-                    piece_name = square.piece.name
-                    if piece_name not in positions:
-                        positions[piece_name] = []
-                    positions[piece_name].append((row, col))
+        for index in iter_bits(self.occupancy[0 if color == 'white' else 1]):
+            row, col = SQUARE_COORDS[index]
+            piece_name = self.squares[row][col].piece.name
+            if piece_name not in positions:
+                positions[piece_name] = []
+            positions[piece_name].append((row, col))
         return positions
 
     def is_game_over(self) -> bool:
@@ -605,7 +823,8 @@ class Board:
         return (self.is_checkmate(self.next_player) or 
                 self.is_stalemate(self.next_player) or 
                 self.is_dead_position() or 
-                self.is_fifty_move_rule())
+                self.is_fifty_move_rule() or
+                self.is_threefold_repetition())
 
     def get_game_result(self) -> str:
         """
@@ -617,7 +836,8 @@ class Board:
         elif self.is_checkmate('black'):
             return '1-0'
         elif (self.is_stalemate('white') or self.is_stalemate('black') or 
-              self.is_dead_position() or self.is_fifty_move_rule()):
+              self.is_dead_position() or self.is_fifty_move_rule() or
+              self.is_threefold_repetition()):
             return '1/2-1/2'
         else:
             return '*'
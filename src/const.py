@@ -7,3 +7,6 @@ SQ_SIZE = WIDTH // COLS  # Each square size in pixels
 
 # Game performance settings
 MAX_FPS = 60  # Frame rate limit for smooth gameplay
+
+# Engine cache settings
+CHECK_CACHE_SIZE = 100000  # Max cached in_check_king results before the cache is reset
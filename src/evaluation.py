@@ -3,9 +3,20 @@ Advanced chess position evaluation module for AI.
 Provides sophisticated evaluation including material, positional, tactical, and endgame evaluation.
 """
 
+from array import array
 from typing import Dict, List, Tuple, Optional
 from const import *
-from piece import Piece, Pawn, Knight, Bishop, Rook, Queen, King
+from piece import Piece, Pawn, Knight, Bishop, Rook, Queen, King, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, PIECE_NAMES
+from evaluation_numba import evaluate_arr
+from rules import Rules
+from bitboard import BETWEEN, iter_bits
+from square import SQUARE_COORDS
+
+# Game phase names indexed by the phase returned from evaluate_arr
+GAME_PHASES = ('opening', 'middlegame', 'endgame')
+
+# Bitboard of the a-file; shift left by col for any other file
+FILE_A = 0x0101010101010101
 
 class Evaluation:
     """
@@ -114,7 +125,7 @@ class Evaluation:
     ]
     
     @staticmethod
-    def evaluate(board) -> float:
+    def evaluate(board) -> int:
         """
         ENHANCED evaluation with advanced chess knowledge.
         Includes sophisticated positional understanding and tactical awareness.
@@ -122,11 +133,15 @@ class Evaluation:
         """
         score = 0.0
         
+        # Material, piece-square tables and game phase come from one compiled pass
+        # over the board's flat piece array
+        material, position, phase = evaluate_arr(board.piece_arr, PIECE_SQUARE_BUFFER)
+        
         # 1. MATERIAL - Most important, must be accurate (weighted)
-        score += Evaluation.evaluate_material(board) * 1.7
+        score += material * 1.7
         
         # 2. GAME PHASE DETECTION
-        game_phase = Evaluation._get_game_phase(board)
+        game_phase = GAME_PHASES[phase]
         
         # 3. HANGING PIECES - Check first to adjust other weights if needed
         hanging_penalty = Evaluation.evaluate_hanging_pieces(board)
@@ -161,7 +176,7 @@ class Evaluation:
             hanging_weight = 3.0
         
         # 5. POSITIONAL - Weight adjusted based on hanging pieces
-        score += Evaluation.evaluate_position(board, game_phase) * position_weight
+        score += position * position_weight
         
         # 6. OPENING PRINCIPLES - Weight adjusted based on hanging pieces
         if game_phase == 'opening':
@@ -196,7 +211,8 @@ class Evaluation:
         # 15. SPACE CONTROL - Weight adjusted based on hanging pieces
         score += Evaluation.evaluate_space_control(board, game_phase) * space_weight
         
-        return score
+        # Whole centipawns - the search works with integer scores only
+        return round(score)
     
     @staticmethod
     def evaluate_debug(board) -> Dict[str, float]:
@@ -354,7 +370,7 @@ class Evaluation:
         
         # Check for discrepancies
         discrepancy = abs(actual_score - debug_total)
-        tolerance = 0.01  # Allow tiny floating point differences
+        tolerance = 0.5  # evaluate() rounds to whole centipawns
         
         verification = {
             'actual_score': actual_score,
@@ -375,25 +391,21 @@ class Evaluation:
         score = 0.0
         piece_counts = {'white': {}, 'black': {}}
         
-        # Count pieces and calculate basic material
-        for row in range(ROWS):
-            for col in range(COLS):
-                square = board.squares[row][col]
-                if square.has_piece and square.piece:
-                    piece = square.piece
-                    if piece.name != 'king':
-                        color = piece.color
-                        piece_type = piece.name
-                        
-                        if piece_type not in piece_counts[color]:
-                            piece_counts[color][piece_type] = 0
-                        piece_counts[color][piece_type] += 1
-                        
-                        value = Evaluation.PIECE_VALUES[piece_type]
-                        if color == 'white':
-                            score += value
-                        else:
-                            score -= value
+        # Count pieces and calculate basic material from the flat piece array
+        for code in board.piece_arr:
+            if code and code != 6 and code != -6:
+                color = 'white' if code > 0 else 'black'
+                piece_type = PIECE_NAMES[abs(code) - 1]
+                
+                if piece_type not in piece_counts[color]:
+                    piece_counts[color][piece_type] = 0
+                piece_counts[color][piece_type] += 1
+                
+                value = Evaluation.PIECE_VALUES[piece_type]
+                if code > 0:
+                    score += value
+                else:
+                    score -= value
         
         # Bishop pair bonus
         if piece_counts['white'].get('bishop', 0) >= 2:
@@ -418,17 +430,13 @@ class Evaluation:
         white_score = 0.0
         black_score = 0.0
         
-        for row in range(ROWS):
-            for col in range(COLS):
-                square = board.squares[row][col]
-                if square.has_piece and square.piece:
-                    piece = square.piece
-                    if piece.name != 'king':  # Exclude kings from material count
-                        value = Evaluation.PIECE_VALUES[piece.name]
-                        if piece.color == 'white':
-                            white_score += value
-                        else:
-                            black_score += value
+        for code in board.piece_arr:
+            if code and code != 6 and code != -6:  # Exclude kings from material count
+                value = Evaluation.PIECE_VALUES[PIECE_NAMES[abs(code) - 1]]
+                if code > 0:
+                    white_score += value
+                else:
+                    black_score += value
         
         return white_score, black_score
     
@@ -522,13 +530,10 @@ class Evaluation:
     @staticmethod
     def _find_king(board, color: str) -> Optional[Tuple[int, int]]:
         """Find king position for given color."""
-        for row in range(ROWS):
-            for col in range(COLS):
-                square = board.squares[row][col]
-                if (square.has_piece and isinstance(square.piece, King) and 
-                    square.piece.color == color):
-                    return (row, col)
-        return None
+        index = board.king_sq[color]
+        if index < 0:
+            return None
+        return SQUARE_COORDS[index]
     
     @staticmethod
     def _king_safety_score(board, king_pos: Tuple[int, int], color: str, game_phase: str = 'middlegame') -> float:
@@ -605,13 +610,9 @@ class Evaluation:
         score = 0.0
         
         for color in ['white', 'black']:
-            pawn_positions = []
-            for row in range(ROWS):
-                for col in range(COLS):
-                    square = board.squares[row][col]
-                    if (square.has_piece and isinstance(square.piece, Pawn) and 
-                        square.piece.color == color):
-                        pawn_positions.append((row, col))
+            # Pawn bitboard bits come out in row-major order, like a board scan
+            pawns = board.bb[0 if color == 'white' else 1][PAWN]
+            pawn_positions = [SQUARE_COORDS[index] for index in iter_bits(pawns)]
             
             structure_score = Evaluation._analyze_pawn_structure(pawn_positions, color, board)
             if color == 'white':
@@ -827,13 +828,10 @@ class Evaluation:
     @staticmethod
     def _get_game_phase(board) -> str:
         """Determine game phase based on material."""
-        total_pieces = 0
-        for row in range(ROWS):
-            for col in range(COLS):
-                if board.squares[row][col].has_piece:
-                    piece = board.squares[row][col].piece
-                    if piece and piece.name != 'king' and piece.name != 'pawn':
-                        total_pieces += 1
+        # Knights, bishops, rooks and queens of both sides, counted straight from the bitboards
+        white, black = board.bb
+        total_pieces = sum((white[piece_type] | black[piece_type]).bit_count()
+                           for piece_type in (KNIGHT, BISHOP, ROOK, QUEEN))
         
         if total_pieces <= 6:
             return 'endgame'
@@ -1124,14 +1122,8 @@ class Evaluation:
     @staticmethod
     def _has_bishop_pair(board, color: str) -> bool:
         """Check if the given color has both bishops."""
-        bishop_count = 0
-        for row in range(ROWS):
-            for col in range(COLS):
-                square = board.squares[row][col]
-                if (square.has_piece and square.piece and 
-                    square.piece.name == 'bishop' and square.piece.color == color):
-                    bishop_count += 1
-        return bishop_count >= 2
+        bishops = board.bb[0 if color == 'white' else 1][BISHOP]
+        return bishops & (bishops - 1) != 0  # At least two bits set
     
     @staticmethod
     def _count_attack_targets(board, piece: Piece, row: int, col: int) -> int:
@@ -1225,11 +1217,8 @@ class Evaluation:
     @staticmethod
     def _is_on_open_file(board, col: int) -> bool:
         """Check if a file is open (no pawns)."""
-        for row in range(ROWS):
-            square = board.squares[row][col]
-            if square.has_piece and square.piece and square.piece.name == 'pawn':
-                return False
-        return True
+        pawns = board.bb[0][PAWN] | board.bb[1][PAWN]
+        return not pawns & (FILE_A << col)
 
     @staticmethod
     def evaluate_tempo_penalty(board) -> float:
@@ -1458,8 +1447,6 @@ class Evaluation:
         Returns:
             True if the piece can move to at least one safe square, False otherwise
         """
-        from rules import Rules
-        
         # Generate all possible moves for this piece
         possible_moves = Rules.generate_pseudo_legal_moves(board, piece, row, col)
         
@@ -1470,9 +1457,11 @@ class Evaluation:
             # Temporarily make the move to check if destination is safe
             original_piece_at_dest = board.squares[dest_row][dest_col].piece
             
-            # Simulate the move
+            # Simulate the move (occupancy too - the line-of-sight tests read it)
             board.squares[row][col].piece = None
             board.squares[dest_row][dest_col].piece = piece
+            side_occupancy = board.occupancy[piece.color_idx]
+            board.occupancy[piece.color_idx] = (side_occupancy & ~(1 << (row * 8 + col))) | (1 << (dest_row * 8 + dest_col))
             
             # Check if this square is attacked by any opponent piece
             is_safe = True
@@ -1492,6 +1481,7 @@ class Evaluation:
             # Restore the board
             board.squares[row][col].piece = piece
             board.squares[dest_row][dest_col].piece = original_piece_at_dest
+            board.occupancy[piece.color_idx] = side_occupancy
             
             # If we found a safe square, the piece can escape
             if is_safe:
@@ -1674,20 +1664,9 @@ class Evaluation:
         if row_diff != col_diff:
             return False
             
-        # Check for blocking pieces
-        row_step = 1 if to_row > from_row else -1
-        col_step = 1 if to_col > from_col else -1
-        
-        current_row = from_row + row_step
-        current_col = from_col + col_step
-        
-        while current_row != to_row and current_col != to_col:
-            if board.squares[current_row][current_col].has_piece:
-                return False  # Path blocked
-            current_row += row_step
-            current_col += col_step
-            
-        return True
+        # Blocked if any square strictly between the two is occupied
+        occupied = board.occupancy[0] | board.occupancy[1]
+        return not (BETWEEN[from_row * 8 + from_col][to_row * 8 + to_col] & occupied)
     
     @staticmethod
     def _rook_can_attack(board, from_row: int, from_col: int, to_row: int, to_col: int) -> bool:
@@ -1696,21 +1675,9 @@ class Evaluation:
         if from_row != to_row and from_col != to_col:
             return False
             
-        # Check for blocking pieces
-        if from_row == to_row:  # Horizontal
-            start_col = min(from_col, to_col) + 1
-            end_col = max(from_col, to_col)
-            for col in range(start_col, end_col):
-                if board.squares[from_row][col].has_piece:
-                    return False
-        else:  # Vertical
-            start_row = min(from_row, to_row) + 1
-            end_row = max(from_row, to_row)
-            for row in range(start_row, end_row):
-                if board.squares[row][from_col].has_piece:
-                    return False
-                    
-        return True
+        # Blocked if any square strictly between the two is occupied
+        occupied = board.occupancy[0] | board.occupancy[1]
+        return not (BETWEEN[from_row * 8 + from_col][to_row * 8 + to_col] & occupied)
     
     @staticmethod
     def _king_can_attack(from_row: int, from_col: int, to_row: int, to_col: int) -> bool:
@@ -1722,3 +1689,26 @@ class Evaluation:
         return row_diff <= 1 and col_diff <= 1 and (row_diff + col_diff > 0)
         
         return penalty
+
+
+def _build_piece_square_buffer() -> array:
+    """
+    Flatten the piece-square tables into one buffer for evaluate_arr.
+    Layout is [slot * 64 + row * 8 + col] with slots 1-5 for pawn to queen,
+    6 for the middlegame king and 7 for the endgame king.
+    """
+    tables = [
+        [[0] * 8 for _ in range(8)],
+        Evaluation.PAWN_TABLE,
+        Evaluation.KNIGHT_TABLE,
+        Evaluation.BISHOP_TABLE,
+        Evaluation.ROOK_TABLE,
+        Evaluation.QUEEN_TABLE,
+        Evaluation.KING_MIDDLEGAME_TABLE,
+        Evaluation.KING_ENDGAME_TABLE,
+    ]
+    return array('i', [value for table in tables for row in table for value in row])
+
+
+PIECE_SQUARE_BUFFER = _build_piece_square_buffer()
+
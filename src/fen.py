@@ -14,6 +14,12 @@ PIECE_MAP = {
     'k': King
 }
 
+# Board piece codes (signed, read back as unsigned bytes) to FEN letters; '1' marks an empty square
+PIECE_CHAR_TABLE = bytes.maketrans(bytes(code & 0xFF for code in range(-6, 7)), b'kqrbnp1PNBRQK')
+
+# Runs of empty squares and the digit each collapses to, longest first
+EMPTY_RUNS = tuple(('1' * length, str(length)) for length in range(8, 1, -1))
+
 class FEN:
     """
     Handles loading chess positions from FEN (Forsyth-Edwards Notation).
@@ -104,31 +110,18 @@ class FEN:
         if isinstance(bq, Rook):
             bq.moved = 'q' not in board.castling_rights
 
+        # Keep the flat piece array used by the evaluator in step with the squares
+        board.sync_piece_arr()
+        board.reset_position_history()
+
     @staticmethod
     def get_fen(board: "Board") -> str:
         """Generate a FEN string from the current board state."""
-        rows = []
-        for r in range(8):
-            row = ''
-            empty = 0
-            for c in range(8):
-                piece = board.squares[r][c].piece
-                if piece is None:
-                    empty += 1
-                else:
-                    if empty > 0:
-                        row += str(empty)
-                        empty = 0
-                    symbol = ''
-                    for k, v in PIECE_MAP.items():
-                        if isinstance(piece, v):
-                            symbol = k
-                            break
-                    row += symbol.upper() if piece.color == 'white' else symbol.lower()
-            if empty > 0:
-                row += str(empty)
-            rows.append(row)
-        fen = '/'.join(rows)
+        # Render all 64 piece codes in one translate call, then collapse the empty runs
+        placement = bytes(board.piece_arr).translate(PIECE_CHAR_TABLE).decode('ascii')
+        fen = '/'.join([placement[i:i + 8] for i in range(0, 64, 8)])
+        for run, digit in EMPTY_RUNS:
+            fen = fen.replace(run, digit)
         fen += ' ' + ('w' if board.next_player == 'white' else 'b')
         fen += ' ' + (board.castling_rights if board.castling_rights else '-')
         fen += ' ' + (board.en_passant if board.en_passant else '-')
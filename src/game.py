@@ -5,6 +5,7 @@ from const import *
 from board import Board
 from dragger import Dragger
 from config import Config
+from theme import BG, TRACE, MOVES, SELECTED
 from square import Square
 from move import Move
 from piece import Queen, Rook, Bishop, Knight, Pawn, Piece
@@ -89,7 +90,7 @@ class Game:
         for row in range(ROWS):
             for col in range(COLS):
                 # Alternate square colors in checkerboard pattern
-                color = theme.bg.dark if (row + col) % 2 == 0 else theme.bg.light
+                color = theme.palette[BG + 1 - (row + col) % 2]
                 rect = (col * SQ_SIZE, row * SQ_SIZE, SQ_SIZE, SQ_SIZE)
                 p.draw.rect(surface, color, rect)
 
@@ -159,7 +160,7 @@ class Game:
         squares = [self.board.last_move.initial, self.board.last_move.final]
         for square in squares:
             row, col = square.row, square.col
-            color = theme.trace.light if (row + col) % 2 == 0 else theme.trace.dark
+            color = theme.palette[TRACE + (row + col) % 2]
             highlight_surface = p.Surface((SQ_SIZE, SQ_SIZE), p.SRCALPHA)
             highlight_surface.fill((*color, 160))
             surface.blit(highlight_surface, (col * SQ_SIZE, row * SQ_SIZE))
@@ -172,7 +173,7 @@ class Game:
         if not self.selected_square:
             return
         row, col = self.selected_square.row, self.selected_square.col
-        color = self.config.theme.selected.light if (row + col) % 2 == 0 else self.config.theme.selected.dark
+        color = self.config.theme.palette[SELECTED + (row + col) % 2]
         highlight_surface = p.Surface((SQ_SIZE, SQ_SIZE), p.SRCALPHA)
         highlight_surface.fill((*color, 160))
         surface.blit(highlight_surface, (col * SQ_SIZE, row * SQ_SIZE))
@@ -184,7 +185,7 @@ class Game:
         """
         col = mouse_pos[0] // SQ_SIZE
         row = mouse_pos[1] // SQ_SIZE
-        color = self.config.theme.moves.light if (row + col) % 2 == 0 else self.config.theme.moves.dark
+        color = self.config.theme.palette[MOVES + (row + col) % 2]
         rect = (col * SQ_SIZE, row * SQ_SIZE, SQ_SIZE, SQ_SIZE)
         p.draw.rect(surface, color, rect, 3)
 
@@ -0,0 +1,141 @@
+"""
+Lazy SMP: parallel search where several processes search the same root
+and only communicate through a transposition table in shared memory.
+"""
+
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+from typing import Optional
+
+# Keys are masked to 64 bits so they fit the shared uint64 slots
+KEY_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+class SharedTranspositionTable:
+    """
+    Fixed-size transposition table backed by a SharedMemory block.
+    Each slot holds a uint64 key and an int64 payload packed as (score << 8) | depth.
+    The key slot stores key ^ payload (lockless hashing) so a slot torn by two
+    processes writing at the same time simply fails verification on probe.
+    """
+
+    SLOT_BYTES = 16  # 8 byte key + 8 byte payload
+
+    def __init__(self, size: int = 1 << 18, name: Optional[str] = None):
+        self.size = size
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size * self.SLOT_BYTES)
+            self.shm.buf[:size * self.SLOT_BYTES] = bytes(size * self.SLOT_BYTES)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.keys = self.shm.buf[:size * 8].cast('Q')
+        self.payloads = self.shm.buf[size * 8:size * self.SLOT_BYTES].cast('q')
+
+    def store(self, key: int, depth: int, score: int) -> None:
+        """Store a search result, keeping the deeper entry when the slot is taken."""
+        key &= KEY_MASK
+        index = key % self.size
+        old_payload = self.payloads[index]
+        if (self.keys[index] ^ (old_payload & KEY_MASK)) == key and (old_payload & 0xFF) > depth:
+            return
+        payload = (score << 8) | (depth & 0xFF)
+        self.payloads[index] = payload
+        self.keys[index] = key ^ (payload & KEY_MASK)
+
+    def probe(self, key: int) -> Optional[tuple]:
+        """Return (depth, score) for the position or None when it is not stored."""
+        key &= KEY_MASK
+        index = key % self.size
+        payload = self.payloads[index]
+        if payload == 0 or (self.keys[index] ^ (payload & KEY_MASK)) != key:
+            return None
+        return payload & 0xFF, payload >> 8
+
+    def close(self) -> None:
+        """Release the views and the shared block (unlinking it if this process created it)."""
+        self.keys.release()
+        self.payloads.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _worker(fen: str, depth: int, max_time: float, worker_id: int,
+            tt_name: str, tt_size: int, results, stop_event) -> None:
+    """
+    Search process entry point.
+    Workers are perturbed so they don't duplicate each other's tree: odd workers
+    search one ply deeper and every helper rotates its root move order.
+    """
+    from board import Board
+    from search import Search
+
+    board = Board()
+    board.set_fen(fen)
+
+    shared_tt = SharedTranspositionTable(tt_size, name=tt_name)
+    search = Search()
+    search.shared_tt = shared_tt
+    search.stop_event = stop_event
+    search.root_rotation = worker_id
+    try:
+        result = search.search(board, depth + worker_id % 2, max_time)
+        best = result.best_move.to_algebraic() if result.best_move else None
+        results.put((worker_id, result.depth, best, result.score, result.nodes))
+    finally:
+        shared_tt.close()
+
+
+def search_parallel(board, depth: int, max_time: float, workers: int):
+    """
+    Run a lazy SMP search with the given number of worker processes.
+    Returns (algebraic best move, score, depth, total nodes) of the deepest
+    completed search, or None when no worker produced a move.
+    """
+    from fen import FEN
+
+    fen = FEN.get_fen(board)
+    context = multiprocessing.get_context()
+    results = context.Queue()
+    stop_event = context.Event()
+    shared_tt = SharedTranspositionTable()
+
+    processes = [
+        context.Process(target=_worker,
+                        args=(fen, depth, max_time, worker_id, shared_tt.name,
+                              shared_tt.size, results, stop_event),
+                        daemon=True)
+        for worker_id in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    best = None
+    total_nodes = 0
+    deadline = time.time() + max_time + 1.0
+    try:
+        for _ in range(workers):
+            try:
+                worker_id, result_depth, move, score, nodes = results.get(timeout=max(0.0, deadline - time.time()))
+            except queue.Empty:
+                break
+            total_nodes += nodes
+            if move is not None and (best is None or result_depth > best[2]):
+                best = (move, score, result_depth)
+            # The first finished worker ends the search for everyone
+            stop_event.set()
+    finally:
+        stop_event.set()
+        for process in processes:
+            process.join(timeout=1.0)
+            if process.is_alive():
+                process.terminate()
+        shared_tt.close()
+
+    if best is None:
+        return None
+    return best[0], best[1], best[2], total_nodes
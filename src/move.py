@@ -8,11 +8,15 @@ class Move:
     Used throughout the engine for move generation, validation, and execution.
     """
     
+    __slots__ = ('initial', 'final', 'captured', 'promotion', 'key')
+    
     def __init__(self, initial: Any, final: Any, captured: Any = None, promotion: Optional[str] = None):
         self.initial = initial    # Starting square of the move
         self.final = final        # Destination square of the move
         self.captured = captured  # Piece captured by this move (if any)
         self.promotion = promotion  # Promotion piece for pawn promotion ('q', 'r', 'b', 'n')
+        # Squares packed as (from << 6) | to - a cheap integer identity for killer tables
+        self.key = (initial.row * 8 + initial.col) << 6 | (final.row * 8 + final.col)
 
     def __str__(self) -> str:
         """String representation showing initial and final coordinates."""
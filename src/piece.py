@@ -1,6 +1,26 @@
 import os
 from move import Move
-from square import Square
+from square import Square, EMPTY_SQUARES
+
+# Piece type codes used by the board's flat piece array (positive = white, negative = black)
+PIECE_CODES = {'pawn': 1, 'knight': 2, 'bishop': 3, 'rook': 4, 'queen': 5, 'king': 6}
+
+# Small integer piece types cached on every piece as piece.code
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+PIECE_TYPES = {'pawn': PAWN, 'knight': KNIGHT, 'bishop': BISHOP, 'rook': ROOK, 'queen': QUEEN, 'king': KING}
+PIECE_NAMES = ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')  # Indexed by piece type
+
+# Piece type a pawn turns into for each promotion letter
+PROMOTION_CODES = {'q': QUEEN, 'r': ROOK, 'b': BISHOP, 'n': KNIGHT}
+
+# Classic 1/3/3/5/9 material points indexed by unsigned piece code (kings count as nothing)
+MATERIAL_POINTS = (0, 1, 3, 3, 5, 9, 0)
+
+def piece_code(piece):
+    """Signed piece code for the flat piece array (0 for an empty square)."""
+    if piece is None:
+        return 0
+    return -piece.code - 1 if piece.color_idx else piece.code + 1
 
 class Piece:
     """
@@ -11,6 +31,8 @@ class Piece:
     def __init__(self, name, color, value):
         self.name = name    # Piece type name (e.g., 'pawn', 'king', 'queen')
         self.color = color  # 'white' or 'black'
+        self.code = PIECE_TYPES[name]  # Integer piece type (PAWN ... KING) for fast comparisons
+        self.color_idx = 0 if color == 'white' else 1  # 0 = white, 1 = black
         self.value = value * (1 if color == 'white' else -1)  # Material value for evaluation
         self.moves = []     # List of currently valid moves for this piece
         self.moved = False  # Track if piece has moved (important for castling and pawn moves)
@@ -67,37 +89,38 @@ class Pawn(Piece):
         moves = []
         start_row = 6 if self.color == 'white' else 1  # Starting rank for two-square moves
         promotion_row = 0 if self.color == 'white' else 7  # Rank where promotion occurs
+        enemy = board.occupancy[1 - self.color_idx]
+        occupied = board.occupancy[self.color_idx] | enemy
 
         # Forward movement (one square)
         one_step = row + self.dir
-        if Square.in_range(one_step) and board.squares[one_step][col].is_empty:
+        if Square.in_range(one_step) and not (occupied >> (one_step * 8 + col)) & 1:
             # Check if this move reaches promotion rank
             if one_step == promotion_row:
                 # Add all four promotion options
                 for promo in ['q', 'r', 'b', 'n']:  # Queen, Rook, Bishop, Knight
-                    moves.append(Move(Square(row, col), Square(one_step, col), promotion=promo))
+                    moves.append(Move(EMPTY_SQUARES[row][col], EMPTY_SQUARES[one_step][col], promotion=promo))
             else:
-                moves.append(Move(Square(row, col), Square(one_step, col)))
+                moves.append(Move(EMPTY_SQUARES[row][col], EMPTY_SQUARES[one_step][col]))
                 
                 # Two-square initial move from starting position
                 two_step = row + 2 * self.dir
-                if row == start_row and board.squares[two_step][col].is_empty:
-                    moves.append(Move(Square(row, col), Square(two_step, col)))
+                if row == start_row and not (occupied >> (two_step * 8 + col)) & 1:
+                    moves.append(Move(EMPTY_SQUARES[row][col], EMPTY_SQUARES[two_step][col]))
 
         # Diagonal captures (left and right)
         for dc in [-1, 1]:
             r, c = one_step, col + dc
-            if Square.in_range(r, c):
-                target = board.squares[r][c]
-                if target.has_enemy_piece(self.color):
-                    # Regular capture
-                    if r == promotion_row:
-                        # Capture with promotion
-                        for promo in ['q', 'r', 'b', 'n']:
-                            moves.append(Move(Square(row, col), Square(r, c), captured=target.piece, promotion=promo))
-                    else:
-                        moves.append(Move(Square(row, col), Square(r, c), captured=target.piece))
-                        
+            if Square.in_range_rc(r, c) and (enemy >> (r * 8 + c)) & 1:
+                # Regular capture
+                captured = board.squares[r][c].piece
+                if r == promotion_row:
+                    # Capture with promotion
+                    for promo in ['q', 'r', 'b', 'n']:
+                        moves.append(Move(EMPTY_SQUARES[row][col], EMPTY_SQUARES[r][c], captured=captured, promotion=promo))
+                else:
+                    moves.append(Move(EMPTY_SQUARES[row][col], EMPTY_SQUARES[r][c], captured=captured))
+
         # En passant capture - special pawn capture rule
         last_move = board.last_move
         if last_move:
@@ -109,7 +132,7 @@ class Pawn(Piece):
                     if last_move.final.row == row and abs(last_move.final.col - col) == 1:
                         ep_row = row + self.dir
                         ep_col = last_move.final.col
-                        moves.append(Move(Square(row, col), Square(ep_row, ep_col, last_piece)))
+                        moves.append(Move(EMPTY_SQUARES[row][col], Square(ep_row, ep_col, last_piece)))
         return moves
 
 class Knight(Piece):
@@ -119,12 +142,11 @@ class Knight(Piece):
     def get_moves(self, row, col, board):
         offsets = [(-2, 1), (-1, 2), (1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1)]
         moves = []
+        own = board.occupancy[self.color_idx]
         for dr, dc in offsets:
             r, c = row + dr, col + dc
-            if Square.in_range(r, c):
-                dest_square = board.squares[r][c]
-                if dest_square.is_empty_or_enemy(self.color):
-                    moves.append(Move(Square(row, col), Square(r, c, dest_square.piece)))
+            if Square.in_range_rc(r, c) and not (own >> (r * 8 + c)) & 1:
+                moves.append(Move(EMPTY_SQUARES[row][col], Square(r, c, board.squares[r][c].piece)))
         return moves
 
 class Bishop(Piece):
@@ -136,14 +158,16 @@ class Bishop(Piece):
 
     def _slide_moves(self, row, col, board, increments):
         moves = []
+        own = board.occupancy[self.color_idx]
+        occupied = own | board.occupancy[1 - self.color_idx]
         for dr, dc in increments:
             r, c = row + dr, col + dc
-            while Square.in_range(r, c):
-                dest_square = board.squares[r][c]
-                if dest_square.is_empty:
-                    moves.append(Move(Square(row, col), Square(r, c)))
-                elif dest_square.has_enemy_piece(self.color):
-                    moves.append(Move(Square(row, col), Square(r, c, dest_square.piece)))
+            while Square.in_range_rc(r, c):
+                bit = 1 << (r * 8 + c)
+                if not occupied & bit:
+                    moves.append(Move(EMPTY_SQUARES[row][col], EMPTY_SQUARES[r][c]))
+                elif not own & bit:
+                    moves.append(Move(EMPTY_SQUARES[row][col], Square(r, c, board.squares[r][c].piece)))
                     break
                 else:
                     break
@@ -160,14 +184,16 @@ class Rook(Piece):
 
     def _slide_moves(self, row, col, board, increments):
         moves = []
+        own = board.occupancy[self.color_idx]
+        occupied = own | board.occupancy[1 - self.color_idx]
         for dr, dc in increments:
             r, c = row + dr, col + dc
-            while Square.in_range(r, c):
-                dest_square = board.squares[r][c]
-                if dest_square.is_empty:
-                    moves.append(Move(Square(row, col), Square(r, c)))
-                elif dest_square.has_enemy_piece(self.color):
-                    moves.append(Move(Square(row, col), Square(r, c, dest_square.piece)))
+            while Square.in_range_rc(r, c):
+                bit = 1 << (r * 8 + c)
+                if not occupied & bit:
+                    moves.append(Move(EMPTY_SQUARES[row][col], EMPTY_SQUARES[r][c]))
+                elif not own & bit:
+                    moves.append(Move(EMPTY_SQUARES[row][col], Square(r, c, board.squares[r][c].piece)))
                     break
                 else:
                     break
@@ -184,14 +210,16 @@ class Queen(Piece):
 
     def _slide_moves(self, row, col, board, increments):
         moves = []
+        own = board.occupancy[self.color_idx]
+        occupied = own | board.occupancy[1 - self.color_idx]
         for dr, dc in increments:
             r, c = row + dr, col + dc
-            while Square.in_range(r, c):
-                dest_square = board.squares[r][c]
-                if dest_square.is_empty:
-                    moves.append(Move(Square(row, col), Square(r, c)))
-                elif dest_square.has_enemy_piece(self.color):
-                    moves.append(Move(Square(row, col), Square(r, c, dest_square.piece)))
+            while Square.in_range_rc(r, c):
+                bit = 1 << (r * 8 + c)
+                if not occupied & bit:
+                    moves.append(Move(EMPTY_SQUARES[row][col], EMPTY_SQUARES[r][c]))
+                elif not own & bit:
+                    moves.append(Move(EMPTY_SQUARES[row][col], Square(r, c, board.squares[r][c].piece)))
                     break
                 else:
                     break
@@ -206,14 +234,14 @@ class King(Piece):
     def get_moves(self, row, col, board):
         offsets = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
         moves = []
+        own = board.occupancy[self.color_idx]
+        occupied = own | board.occupancy[1 - self.color_idx]
 
         # Normal adjacent moves
         for dr, dc in offsets:
             r, c = row + dr, col + dc
-            if Square.in_range(r, c):
-                dest_square = board.squares[r][c]
-                if dest_square.is_empty_or_enemy(self.color):
-                    moves.append(Move(Square(row, col), Square(r, c, dest_square.piece)))
+            if Square.in_range_rc(r, c) and not (own >> (r * 8 + c)) & 1:
+                moves.append(Move(EMPTY_SQUARES[row][col], Square(r, c, board.squares[r][c].piece)))
 
         # Castling candidates (legal castling checks)
         if not self.moved and board.castling_rights:
@@ -233,20 +261,20 @@ class King(Piece):
                 if can_castle_kingside:
                     rook_sq = board.squares[back_row][7]
                     if isinstance(rook_sq.piece, Rook) and not rook_sq.piece.moved:
-                        if all(board.squares[back_row][c].is_empty for c in [5, 6]):
+                        if not occupied & (0b01100000 << (back_row * 8)):
                             # Check that king doesn't pass through or land on attacked squares
                             if (not Rules.is_square_attacked_simple(board, back_row, 5, enemy_color) and 
                                 not Rules.is_square_attacked_simple(board, back_row, 6, enemy_color)):
-                                moves.append(Move(Square(row, col), Square(back_row, 6)))
+                                moves.append(Move(EMPTY_SQUARES[row][col], EMPTY_SQUARES[back_row][6]))
 
                 # Queen-side
                 if can_castle_queenside:
                     rook_sq = board.squares[back_row][0]
                     if isinstance(rook_sq.piece, Rook) and not rook_sq.piece.moved:
-                        if all(board.squares[back_row][c].is_empty for c in [1, 2, 3]):
+                        if not occupied & (0b00001110 << (back_row * 8)):
                             # Check that king doesn't pass through or land on attacked squares
                             if (not Rules.is_square_attacked_simple(board, back_row, 3, enemy_color) and 
                                 not Rules.is_square_attacked_simple(board, back_row, 2, enemy_color)):
-                                moves.append(Move(Square(row, col), Square(back_row, 2)))
+                                moves.append(Move(EMPTY_SQUARES[row][col], EMPTY_SQUARES[back_row][2]))
 
         return moves
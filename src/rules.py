@@ -1,5 +1,5 @@
 from move import Move
-from square import Square
+from square import Square, EMPTY_SQUARES
 from piece import *
 
 class Rules:
@@ -16,13 +16,13 @@ class Rules:
         but may leave the king in check). These moves are later filtered for legality.
         """
         moves = []
+        codes = board.piece_arr  # Signed piece codes, row * 8 + col
+        sign = 1 if piece.color == 'white' else -1
 
         def add_move_if_valid(r, c):
             """Helper function to add a move if the target square is valid and not occupied by own piece."""
-            if Square.in_range(r, c):
-                sq = board.squares[r][c]
-                if sq.is_empty_or_enemy(piece.color):
-                    moves.append(Move(Square(row, col), Square(r, c, sq.piece)))
+            if Square.in_range_rc(r, c) and codes[r * 8 + c] * sign <= 0:
+                moves.append(Move(EMPTY_SQUARES[row][col], Square(r, c, board.squares[r][c].piece)))
 
         # Pawn movement rules - most complex piece due to special moves
         if isinstance(piece, Pawn):
@@ -30,18 +30,17 @@ class Rules:
             start_row = 6 if piece.color == 'white' else 1  # Starting rank for two-square moves
             
             # Forward movement (one square)
-            if Square.in_range(row + dir) and board.squares[row + dir][col].is_empty:
-                moves.append(Move(Square(row, col), Square(row + dir, col)))
+            if Square.in_range(row + dir) and not codes[(row + dir) * 8 + col]:
+                moves.append(Move(EMPTY_SQUARES[row][col], EMPTY_SQUARES[row + dir][col]))
                 # Two-square initial move from starting position
-                if row == start_row and Square.in_range(row + dir * 2) and board.squares[row + dir * 2][col].is_empty:
-                    moves.append(Move(Square(row, col), Square(row + dir * 2, col)))
+                if row == start_row and Square.in_range(row + dir * 2) and not codes[(row + dir * 2) * 8 + col]:
+                    moves.append(Move(EMPTY_SQUARES[row][col], EMPTY_SQUARES[row + dir * 2][col]))
             
             # Diagonal captures
             for dc in [-1, 1]:  # Left and right diagonals
-                if Square.in_range(row + dir, col + dc):
+                if Square.in_range_rc(row + dir, col + dc) and codes[(row + dir) * 8 + col + dc] * sign < 0:
                     sq = board.squares[row + dir][col + dc]
-                    if sq.has_enemy_piece(piece.color):
-                        moves.append(Move(Square(row, col), Square(row + dir, col + dc, sq.piece)))
+                    moves.append(Move(EMPTY_SQUARES[row][col], Square(row + dir, col + dc, sq.piece)))
                 
                 # En passant capture - pawn captures diagonally to empty square
                 if row == (3 if piece.color == 'white' else 4) and Square.in_range(col + dc):
@@ -53,9 +52,9 @@ class Rules:
                     # Check if this matches the en passant target square
                     if board.en_passant == target_square:
                         # Verify there's an enemy pawn next to us to capture
-                        side_sq = board.squares[row][col + dc]
-                        if side_sq.has_piece and isinstance(side_sq.piece, Pawn) and side_sq.piece.color != piece.color:
-                            moves.append(Move(Square(row, col), Square(row + dir, col + dc, side_sq.piece)))
+                        if codes[row * 8 + col + dc] == -sign:  # Enemy pawn code
+                            side_piece = board.squares[row][col + dc].piece
+                            moves.append(Move(EMPTY_SQUARES[row][col], Square(row + dir, col + dc, side_piece)))
 
         # Knight moves - L-shaped jumps to all 8 possible positions
         elif isinstance(piece, Knight):
@@ -76,13 +75,13 @@ class Rules:
             # For each direction, slide until hitting a piece or board edge
             for dr, dc in directions:
                 r, c = row + dr, col + dc
-                while Square.in_range(r, c):
-                    sq = board.squares[r][c]
-                    if sq.is_empty:
-                        moves.append(Move(Square(row, col), Square(r, c)))
-                    elif sq.has_enemy_piece(piece.color):
+                while Square.in_range_rc(r, c):
+                    target = codes[r * 8 + c] * sign  # Positive = own piece, negative = enemy
+                    if not target:
+                        moves.append(Move(EMPTY_SQUARES[row][col], EMPTY_SQUARES[r][c]))
+                    elif target < 0:
                         # Can capture enemy piece, but can't continue sliding
-                        moves.append(Move(Square(row, col), Square(r, c, sq.piece)))
+                        moves.append(Move(EMPTY_SQUARES[row][col], Square(r, c, board.squares[r][c].piece)))
                         break
                     else:
                         # Blocked by own piece
@@ -102,6 +101,7 @@ class Rules:
             # Castling - special king move under specific conditions
             if not piece.moved and board.castling_rights:
                 back_row = 7 if piece.color == 'white' else 0
+                back_base = back_row * 8  # piece_arr index of the back rank's a-file square
                 
                 # Check castling rights from board FEN notation
                 can_castle_kingside = ('K' in board.castling_rights) if piece.color == 'white' else ('k' in board.castling_rights)
@@ -117,22 +117,22 @@ class Rules:
                         rook_sq = board.squares[back_row][7]
                         if isinstance(rook_sq.piece, Rook) and not rook_sq.piece.moved:
                             # Check that squares between king and rook are empty
-                            if all(board.squares[back_row][c].is_empty for c in [5, 6]):
+                            if not any(codes[back_base + 5:back_base + 7]):
                                 # King cannot pass through or land on attacked squares
                                 if (not Rules.is_square_attacked_simple(board, back_row, 5, enemy_color) and 
                                     not Rules.is_square_attacked_simple(board, back_row, 6, enemy_color)):
-                                    moves.append(Move(Square(row, col), Square(back_row, 6)))
+                                    moves.append(Move(EMPTY_SQUARES[row][col], EMPTY_SQUARES[back_row][6]))
 
                     # Queenside castling (long castle)
                     if can_castle_queenside:
                         rook_sq = board.squares[back_row][0]
                         if isinstance(rook_sq.piece, Rook) and not rook_sq.piece.moved:
                             # Check that squares between king and rook are empty
-                            if all(board.squares[back_row][c].is_empty for c in [1, 2, 3]):
+                            if not any(codes[back_base + 1:back_base + 4]):
                                 # King cannot pass through or land on attacked squares
                                 if (not Rules.is_square_attacked_simple(board, back_row, 3, enemy_color) and 
                                     not Rules.is_square_attacked_simple(board, back_row, 2, enemy_color)):
-                                    moves.append(Move(Square(row, col), Square(back_row, 2)))
+                                    moves.append(Move(EMPTY_SQUARES[row][col], EMPTY_SQUARES[back_row][2]))
 
         return moves
 
@@ -206,10 +206,14 @@ class Rules:
         """
         legal_moves = []
         for move in Rules.generate_pseudo_legal_moves(board, piece, row, col):
-            # Temporarily make the move
+            # Temporarily make the move (occupancy too - move generation reads it)
             captured = board.squares[move.final.row][move.final.col].piece
             board.squares[move.initial.row][move.initial.col].piece = None
             board.squares[move.final.row][move.final.col].piece = piece
+            saved_occupancy = list(board.occupancy)
+            final_bit = 1 << (move.final.row * 8 + move.final.col)
+            board.occupancy[piece.color_idx] ^= (1 << (move.initial.row * 8 + move.initial.col)) | final_bit
+            board.occupancy[1 - piece.color_idx] &= ~final_bit
 
             # Check if this move leaves our king in check
             if not Rules.is_in_check(board, piece.color):
@@ -218,5 +222,6 @@ class Rules:
             # Restore the board state
             board.squares[move.initial.row][move.initial.col].piece = piece
             board.squares[move.final.row][move.final.col].piece = captured
+            board.occupancy[:] = saved_occupancy
 
         return legal_moves
\ No newline at end of file
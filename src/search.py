@@ -4,17 +4,63 @@ Implements the core AI decision-making logic.
 """
 
 import time
+from array import array
 from typing import Optional, Tuple, List
-from math import inf
 from board import Board
 from move import Move
-from piece import Piece, King
-from evaluation import Evaluation
+from piece import Piece, King, PAWN, KNIGHT, BISHOP, QUEEN, KING
+from evaluation import Evaluation, PIECE_SQUARE_BUFFER
+from evaluation_numba import evaluate_batch
 from see import SEE
+from bitboard import PAWN_ATTACKERS_OF, is_attacked
+from lazy_smp import search_parallel
+
+# Piece values for MVV-LVA capture ordering
+PIECE_VALUES = (100, 320, 330, 500, 900, 20000)  # Centipawns indexed by piece type (PAWN ... KING)
+
+# Square bitmasks (bit row * 8 + col) of d4/d5/e4/e5 and the ring of twelve around them
+CENTER_MASK = sum(1 << (row * 8 + col) for row in (3, 4) for col in (3, 4))
+EXT_CENTER_MASK = sum(1 << (row * 8 + col) for row in range(2, 6) for col in range(2, 6)) & ~CENTER_MASK
+CENTER_SQUARES_MASK = CENTER_MASK | EXT_CENTER_MASK
+
+# Move ordering classes, each far above any score inside a class
+ORDER_BUCKET = 1 << 40
+ORDER_CHECKMATE = 3 * ORDER_BUCKET
+ORDER_CAPTURE = 2 * ORDER_BUCKET
+ORDER_QUIET = ORDER_BUCKET
+ORDER_LOSING_CAPTURE = 0
+
+# Piece types that get development bonuses
+_IS_MINOR = frozenset((KNIGHT, BISHOP))
+
+# Score bound used instead of infinity so every score stays an integer (centipawns)
+SCORE_INF = 10 ** 9
+
+# Transposition table size limit (entries)
+TT_MAX_ENTRIES = 50000
+
+# Leaf positions evaluated per batch (more than the legal moves of any position)
+LEAF_BATCH = 256
+
+# Preallocated frames for the iterative _minimax (grown on demand)
+MAX_PLY = 64
+
+# _StackFrame states
+_FRAME_GENERATE = 0  # Moves not generated yet
+_FRAME_NULL = 1      # Waiting for the null move search
+_FRAME_NEXT = 2      # Ready to search the next move
+_FRAME_CHILD = 3     # Waiting for the (possibly reduced) child search
+_FRAME_RESEARCH = 4  # Waiting for the full depth LMR re-search
+
+class _StackFrame:
+    """One node of the iterative _minimax - the locals a recursive call would keep."""
+    __slots__ = ('depth', 'alpha', 'beta', 'maximizing', 'extension_count', 'board_hash',
+                 'current_player', 'in_check', 'state', 'null_player', 'moves', 'move_index',
+                 'best_score', 'piece', 'move', 'move_info', 'reduction', 'search_depth')
 
 class SearchResult:
     """Container for search results."""
-    def __init__(self, best_move: Optional[Move] = None, score: float = 0.0, depth: int = 0, nodes: int = 0):
+    def __init__(self, best_move: Optional[Move] = None, score: int = 0, depth: int = 0, nodes: int = 0):
         self.best_move = best_move
         self.score = score
         self.depth = depth
@@ -28,14 +74,24 @@ class Search:
     
     def __init__(self):
         self.nodes_searched = 0
-        self.start_time = 0.0
+        self.start_time_ns = 0  # time.monotonic_ns() at the start of the search
         self.max_time = 2.0  # Reduced time for Python performance
+        self.max_time_ns = 0  # max_time in integer nanoseconds
+        self._node_counter = 0  # _should_stop calls since the search started
+        self._time_check_mask = 0x3FF  # Read the clock once every 1024 _should_stop calls
         self.max_depth = 4   # Reduced depth for Python performance
         self.transposition_table = {}  # Enhanced transposition table with mate support
-        self.killer_moves = {}  # Killer move heuristic
+        self.tt_gen = 0  # Search generation, entries from older searches are replaced first
+        self.killer_moves = {}  # Killer move heuristic: depth -> up to two Move.key ints
         self.mate_cache = {}  # Mate distance hash table (Solution 1)
         self.mate_sequences = {}  # Move sequence caching (Solution 7)
         self.debug_mode = False  # Disabled by default for performance
+        self.shared_tt = None  # SharedTranspositionTable when running as a lazy SMP worker
+        self.stop_event = None  # Set by the lazy SMP coordinator to stop all workers
+        self.root_rotation = 0  # Root move order perturbation for lazy SMP helpers
+        self._leaf_buf = array('b', bytes(64 * LEAF_BATCH))  # Piece arrays of frontier children
+        self._leaf_scores = array('i', bytes(4 * LEAF_BATCH))  # evaluate_batch output
+        self._stack = [_StackFrame() for _ in range(MAX_PLY)]  # Reused frames of the iterative _minimax
         
     def set_debug_mode(self, enabled: bool):
         """Enable or disable debug mode to show evaluation calculations."""
@@ -54,13 +110,19 @@ class Search:
             SearchResult containing best move and evaluation
         """
         self.nodes_searched = 0
-        self.start_time = time.time()
+        self.start_time_ns = time.monotonic_ns()
         self.max_time = max_time
+        self.max_time_ns = int(max_time * 1_000_000_000)
+        self._node_counter = 0
         self.max_depth = depth
         
-        # Clear tables for new search
-        self.transposition_table.clear()
-        self.killer_moves.clear()
+        # Keep the transposition table and killers between searches - earlier results
+        # bootstrap move ordering and cut off repeated subtrees. Entries from older
+        # generations are dropped once the table gets crowded.
+        self.tt_gen += 1
+        if len(self.transposition_table) > TT_MAX_ENTRIES * 3 // 4:
+            self.transposition_table = {key: entry for key, entry in self.transposition_table.items()
+                                        if entry['gen'] == self.tt_gen - 1}
         # Note: We intentionally keep mate_cache and mate_sequences between searches
         # as they contain valuable long-term knowledge
         
@@ -83,7 +145,7 @@ class Search:
         # Always try at least depth 1 to ensure we have some move
         for current_depth in range(1, depth + 1):
             # Give more time to deeper searches - don't abort too early
-            if current_depth > 1 and self._should_stop() and current_depth > depth // 2:
+            if current_depth > 1 and self._time_up() and current_depth > depth // 2:
                 break
                 
             try:
@@ -130,33 +192,47 @@ class Search:
                 break
         
         best_result.nodes = self.nodes_searched
-        elapsed = time.time() - self.start_time
+        elapsed = (time.monotonic_ns() - self.start_time_ns) / 1_000_000_000
         nps = best_result.nodes / elapsed if elapsed > 0 else 0
         print(f"Search completed: {best_result.nodes} nodes in {elapsed:.2f}s ({nps:.0f} n/s)")
         
         return best_result
     
+    def search_parallel(self, board: Board, depth: int = 4, max_time: float = 2.0, workers: int = 1) -> SearchResult:
+        """
+        Lazy SMP search: several processes search the same root and share
+        results through a transposition table in shared memory.
+        Falls back to the single-process search() when workers is 1.
+        """
+        if workers <= 1:
+            return self.search(board, depth, max_time)
+        
+        outcome = search_parallel(board, depth, max_time, workers)
+        if outcome is None:
+            return SearchResult()
+        
+        notation, score, result_depth, nodes = outcome
+        return SearchResult(Move.from_algebraic(notation, board), score, result_depth, nodes)
+    
     def _minimax_root(self, board: Board, depth: int) -> SearchResult:
         """Root minimax call for the current player with proper alpha-beta."""
-        from evaluation import Evaluation  # Import at function start to avoid scoping issues
-        
         best_move = None
         current_player = board.next_player  # Store BEFORE making moves
         
         # Initialize alpha-beta window
-        alpha = -inf
-        beta = inf
+        alpha = -SCORE_INF
+        beta = SCORE_INF
         
         # Since evaluation is always from white's perspective:
         # - White wants to MAXIMIZE the evaluation score
         # - Black wants to MINIMIZE the evaluation score  
         if current_player == 'white':
-            best_score = -inf  # White maximizes
+            best_score = -SCORE_INF  # White maximizes
         else:
-            best_score = inf   # Black minimizes
+            best_score = SCORE_INF   # Black minimizes
         
         # SOLUTION 1 & 7: Check mate cache first (immediate lookup without search)
-        board_hash = hash(str(board.squares))  # Simple position hash
+        board_hash = board.position_key()  # Incremental Zobrist key, side to move included
         if board_hash in self.mate_cache:
             mate_entry = self.mate_cache[board_hash]
             # Verify the cached mate is still valid (moves haven't been undone)
@@ -176,7 +252,23 @@ class Search:
                     mate_score = 19999 - sequence_entry['moves_to_mate'] if current_player == 'white' else -19999 + sequence_entry['moves_to_mate']
                     return SearchResult(first_move, mate_score, depth)
         
-        moves = self._get_ordered_moves(board, current_player)
+        moves = self._get_ordered_moves(board, current_player, depth)
+        
+        # PV move: search the previous iteration's best move first
+        tt_entry = self.transposition_table.get(board_hash)
+        pv_move = tt_entry['best_move'] if tt_entry else None
+        if pv_move is not None:
+            for index, (piece, move) in enumerate(moves):
+                if move == pv_move:
+                    if index:
+                        moves.insert(0, moves.pop(index))
+                    break
+        
+        # Lazy SMP helpers rotate everything after the first move so workers
+        # explore different subtrees first
+        if self.root_rotation and len(moves) > 2:
+            shift = self.root_rotation % (len(moves) - 1)
+            moves = moves[:1] + moves[1 + shift:] + moves[1:1 + shift]
         
         if not moves:
             # No legal moves available
@@ -343,7 +435,6 @@ class Search:
                     print(f"💾 CACHING MATE SEQUENCE: {len(sequence)} moves starting with {best_move.to_algebraic()}")
         
         # Store the result in transposition table with best move
-        board_hash = hash(str(board.squares))
         self._store_transposition_simple(board_hash, depth, best_score, best_move)
         
         # Return the score from the correct perspective
@@ -351,9 +442,11 @@ class Search:
         # the score as-is (it's already in the right perspective)
         return SearchResult(best_move, best_score, depth)
     
-    def _minimax(self, board: Board, depth: int, alpha: float, beta: float, maximizing: bool, allow_null: bool = True, extension_count: int = 0) -> float:
+    def _minimax(self, board: Board, depth: int, alpha: int, beta: int, maximizing: bool, allow_null: bool = True, extension_count: int = 0) -> int:
         """
         Minimax algorithm with alpha-beta pruning, null move pruning, and late move reductions.
+        Runs iteratively over an explicit stack of _StackFrame objects instead of
+        recursing, so every node costs a loop iteration rather than a Python call.
         
         Args:
             board: Current board position
@@ -367,231 +460,252 @@ class Search:
         Returns:
             Evaluation score of the position
         """
-        self.nodes_searched += 1
+        stack = self._stack
+        sp = -1  # Index of the innermost open frame
+        score = 0
         
-        # FAIL-SAFE: Prevent infinite recursion
-        if depth < 0:
-            return Evaluation.evaluate(board)
+        # Parameters of the node about to be entered
+        entering = True
+        node_depth, node_alpha, node_beta = depth, alpha, beta
+        node_maximizing, node_allow_null, node_extension = maximizing, allow_null, extension_count
         
-        # Check transposition table
-        board_hash = self._hash_board_fast(board)
-        # Re-enabled transposition table for performance
-        if board_hash in self.transposition_table:
-            entry = self.transposition_table[board_hash]
-            if entry['depth'] >= depth:
-                return entry['score']  # Simple exact match only for speed
-        
-        # Terminal conditions
-        if depth == 0:
-            # CRITICAL: Always use the main evaluation function that includes hanging pieces
-            # This ensures consistency between search and static evaluation
-            # DISABLED: quiescence search for debugging - it was causing evaluation inconsistencies
-            score = Evaluation.evaluate(board)
-            self._store_transposition_simple(board_hash, depth, score)
-            return score
-        
-        if self._should_stop():
-            raise TimeoutError("Search time limit exceeded")
-        
-        # Game over check
-        current_player = 'white' if maximizing else 'black'
-        if board.is_game_over():
-            if board.is_checkmate(current_player):
-                # Checkmate is bad for the current player
-                # Score mate based on distance: faster mates are better
-                mate_distance = self.max_depth - depth  # How many moves from root to mate
-                
-                if maximizing:
-                    # White is in checkmate (bad for white)
-                    # Use negative score, with faster mates being worse (more negative)
-                    score = -19999 + mate_distance  # Mate in 1 = -19999, mate in 2 = -19998, etc.
+        try:
+            while True:
+                if entering:
+                    entering = False
+                    resolved = True  # Cleared when the node needs its own frame
+                    self.nodes_searched += 1
+                    
+                    # FAIL-SAFE: Prevent infinite recursion
+                    if node_depth < 0:
+                        score = Evaluation.evaluate(board)
+                    elif board.is_repetition():
+                        # Repetitions are draws - not stored, the score depends on the path
+                        score = 0
+                    else:
+                        # Check transposition table
+                        board_hash = board.position_key()
+                        entry = self.transposition_table.get(board_hash)
+                        shared_entry = None
+                        if entry is None and self.shared_tt is not None:
+                            # Lazy SMP: pick up results written by the other workers
+                            shared_entry = self.shared_tt.probe(board_hash)
+                        
+                        if entry is not None and entry['depth'] >= node_depth:
+                            score = entry['score']  # Simple exact match only for speed
+                        elif shared_entry is not None and shared_entry[0] >= node_depth:
+                            score = shared_entry[1]
+                        elif node_depth == 0:
+                            # CRITICAL: Always use the main evaluation function that includes hanging pieces
+                            # This ensures consistency between search and static evaluation
+                            # DISABLED: quiescence search for debugging - it was causing evaluation inconsistencies
+                            score = Evaluation.evaluate(board)
+                            self._store_transposition_simple(board_hash, node_depth, score)
+                        else:
+                            if self._should_stop():
+                                raise TimeoutError("Search time limit exceeded")
+                            
+                            # Draws that don't need move generation (checkmate and stalemate are
+                            # detected below from the ordered move list instead)
+                            if board.is_fifty_move_rule() or board.is_dead_position():
+                                score = 0
+                                self._store_transposition_simple(board_hash, node_depth, 0)
+                            else:
+                                resolved = False
+                                sp += 1
+                                if sp == len(stack):
+                                    stack.append(_StackFrame())
+                                frame = stack[sp]
+                                frame.depth = node_depth
+                                frame.alpha = node_alpha
+                                frame.beta = node_beta
+                                frame.maximizing = node_maximizing
+                                frame.extension_count = node_extension
+                                frame.board_hash = board_hash
+                                frame.current_player = 'white' if node_maximizing else 'black'
+                                frame.in_check = board.in_check_king(frame.current_player)
+                                frame.state = _FRAME_GENERATE
+                                
+                                # Null Move Pruning - Balanced approach (not too aggressive)
+                                if (node_allow_null and 
+                                    node_depth >= 3 and  # Restored to depth >= 3 for better decision quality
+                                    not frame.in_check and 
+                                    not self._is_endgame(board)):
+                                    
+                                    # Make null move: the side to move passes and the opponent moves again.
+                                    # If a reduced search still fails high (maximizer) or low (minimizer)
+                                    # against a null window, the real moves will do at least as well.
+                                    frame.null_player = self._make_null_move(board)
+                                    frame.state = _FRAME_NULL
+                                    
+                                    # Search with moderate reduction for balanced speed/accuracy
+                                    reduction = 3  # Fixed reduction instead of aggressive variable reduction
+                                    entering = True
+                                    node_depth = node_depth - reduction
+                                    if node_maximizing:
+                                        node_alpha, node_beta = node_beta - 1, node_beta
+                                    else:
+                                        node_alpha, node_beta = node_alpha, node_alpha + 1
+                                    node_maximizing = not node_maximizing
+                                    node_allow_null = False
+                                    continue
+                    
                 else:
-                    # Black is in checkmate (good for white)  
-                    # Use positive score, with faster mates being better (more positive)
-                    score = 19999 - mate_distance   # Mate in 1 = 19999, mate in 2 = 19998, etc.
+                    resolved = True  # Only reached after a frame was popped with its score
                 
-                self._store_transposition_simple(board_hash, depth, score)
-                return score
-            else:
-                self._store_transposition_simple(board_hash, depth, 0)
-                return 0  # Stalemate or draw
-        
-        # Null Move Pruning - Balanced approach (not too aggressive)
-        current_player = 'white' if maximizing else 'black'
-        in_check = board.in_check_king(current_player)
-        
-        if (allow_null and 
-            depth >= 3 and  # Restored to depth >= 3 for better decision quality
-            not in_check and 
-            not self._is_endgame(board)):
-            
-            # Get current evaluation to see if position is promising
-            current_eval = Evaluation.evaluate(board)
-            # Convert to current player's perspective
-            if not maximizing:  # Black's turn
-                current_eval = -current_eval
-            
-            # Conservative beta cutoff threshold (restored)
-            if current_eval >= beta:
-                # Make null move
-                original_player = self._make_null_move(board)
-                
-                try:
-                    # Search with moderate reduction for balanced speed/accuracy
-                    reduction = 3  # Fixed reduction instead of aggressive variable reduction
-                    null_score = self._minimax(board, depth - reduction, -beta, -beta + 1, not maximizing, allow_null=False, extension_count=extension_count)
-                except TimeoutError:
-                    # Unmake null move on timeout
-                    self._unmake_null_move(board, original_player)
-                    raise
-                
-                # Unmake null move
-                self._unmake_null_move(board, original_player)
-                
-                # Null move cutoff
-                if null_score >= beta:
-                    return beta
-        
-        moves = self._get_ordered_moves(board, current_player)
-        
-        if not moves:
-            # self._store_transposition(board_hash, depth, 0, 'exact')  # Disabled for performance
-            return 0  # No legal moves (shouldn't happen if game_over check works)
-        
-        original_alpha = alpha
-        best_score = -inf if maximizing else inf
-        
-        if maximizing:
-            for move_index, (piece, move) in enumerate(moves):
-                # CLEAN ALPHA-BETA WITH LMR
-                # Determine if this move is dangerous (shouldn't be reduced)
-                is_dangerous = self._is_dangerous_move(board, piece, move)
-                
-                # Calculate Late Move Reduction amount
-                reduction = self._calculate_lmr_reduction(move_index, depth, is_dangerous)
-                # Ensure depth always decreases by at least 1
-                search_depth = max(0, depth - 1 - reduction)
+                # Hand a child's score back to the frame that is waiting for it
+                if resolved:
+                    if sp < 0:
+                        return score
+                    frame = stack[sp]
+                    state = frame.state
+                    if state == _FRAME_NULL:
+                        # Unmake null move
+                        self._unmake_null_move(board, frame.null_player)
+                        frame.state = _FRAME_GENERATE
+                        
+                        # Null move cutoff
+                        if frame.maximizing and score >= frame.beta:
+                            score = frame.beta
+                            sp -= 1
+                            continue
+                        if not frame.maximizing and score <= frame.alpha:
+                            score = frame.alpha
+                            sp -= 1
+                            continue
+                    else:
+                        # LMR Re-search: Only if we got a really good score and used reduction
+                        if (state == _FRAME_CHILD and frame.reduction > 0 and
+                                frame.search_depth < frame.depth - 1 and
+                                (score > frame.alpha if frame.maximizing else score < frame.beta)):
+                            # Re-search at full depth if the reduced search found a good move
+                            frame.state = _FRAME_RESEARCH
+                            entering = True
+                            node_depth, node_alpha, node_beta = frame.depth - 1, frame.alpha, frame.beta
+                            node_maximizing, node_allow_null, node_extension = not frame.maximizing, True, 0
+                            continue
+                        
+                        board.unmake_move_fast(frame.piece, frame.move, frame.move_info)
+                        frame.state = _FRAME_NEXT
+                        
+                        if frame.maximizing:
+                            # Update best score for maximizing player
+                            if score > frame.best_score:
+                                frame.best_score = score
+                            # Alpha-beta pruning: update alpha
+                            if score > frame.alpha:
+                                frame.alpha = score
+                        else:
+                            # Update best score for minimizing player
+                            if score < frame.best_score:
+                                frame.best_score = score
+                            # Alpha-beta pruning: update beta
+                            if score < frame.beta:
+                                frame.beta = score
+                        
+                        # Cutoff: if alpha >= beta, prune remaining moves
+                        if frame.alpha >= frame.beta:
+                            # Store killer move for non-captures
+                            if not frame.move.is_capture():
+                                self._store_killer_move(frame.move, frame.depth)
+                            frame.move_index = len(frame.moves)
                 
-                move_info = board.make_move_fast(piece, move)
-                try:
-                    # WHITE's turn (maximizing): after move, BLACK responds (minimizing)
-                    eval_score = self._minimax(board, search_depth, alpha, beta, False, allow_null=True, extension_count=extension_count)
+                if frame.state == _FRAME_GENERATE:
+                    moves = self._get_ordered_moves(board, frame.current_player, frame.depth)
                     
-                    # Hanging pieces are already evaluated in Evaluation.evaluate()
-                    
-                    # LMR Re-search: Only if we got a really good score and used reduction
-                    if reduction > 0 and eval_score > alpha and search_depth < depth - 1:
-                        # Re-search at full depth if the reduced search found a good move
-                        full_eval_score = self._minimax(board, depth - 1, alpha, beta, False, allow_null=True)
-                        eval_score = full_eval_score
+                    if not moves:
+                        # No legal moves: checkmate or stalemate
+                        if frame.in_check:
+                            # Checkmate is bad for the current player
+                            # Score mate based on distance: faster mates are better
+                            mate_distance = self.max_depth - frame.depth  # How many moves from root to mate
+                            
+                            if frame.maximizing:
+                                # White is in checkmate (bad for white)
+                                # Use negative score, with faster mates being worse (more negative)
+                                score = -19999 + mate_distance  # Mate in 1 = -19999, mate in 2 = -19998, etc.
+                            else:
+                                # Black is in checkmate (good for white)  
+                                # Use positive score, with faster mates being better (more positive)
+                                score = 19999 - mate_distance   # Mate in 1 = 19999, mate in 2 = 19998, etc.
+                        else:
+                            score = 0  # Stalemate
+                        
+                        self._store_transposition_simple(frame.board_hash, frame.depth, score)
+                        sp -= 1
+                        continue
                     
-                except TimeoutError:
-                    board.unmake_move_fast(piece, move, move_info)
-                    raise
-                board.unmake_move_fast(piece, move, move_info)
+                    frame.moves = moves
+                    frame.move_index = 0
+                    frame.best_score = -SCORE_INF if frame.maximizing else SCORE_INF
+                    frame.state = _FRAME_NEXT
                 
-                # Update best score for maximizing player
-                if eval_score > best_score:
-                    best_score = eval_score
-                
-                # Alpha-beta pruning: update alpha
-                if eval_score > alpha:
-                    alpha = eval_score
-                    
-                # Beta cutoff: if alpha >= beta, prune remaining moves
-                if alpha >= beta:
-                    # Store killer move for non-captures
-                    if not move.is_capture():
-                        self._store_killer_move(move, depth)
-                    break  # Beta cutoff
-        else:
-            for move_index, (piece, move) in enumerate(moves):
                 # CLEAN ALPHA-BETA WITH LMR
-                # Determine if this move is dangerous (shouldn't be reduced)
-                is_dangerous = self._is_dangerous_move(board, piece, move)
+                while frame.move_index < len(frame.moves):
+                    piece, move = frame.moves[frame.move_index]
+                    # Determine if this move is dangerous (shouldn't be reduced)
+                    is_dangerous = self._is_dangerous_move(board, piece, move)
+                    
+                    # Late Move Pruning: near the frontier, quiet moves this far down
+                    # the ordering are skipped instead of reduced
+                    if (frame.depth <= 3 and frame.move_index > 3 + frame.depth * frame.depth and
+                            not is_dangerous and not frame.in_check and
+                            not self._is_killer_move(move, frame.depth)):
+                        frame.move_index += 1
+                        continue
+                    break
+                
+                if frame.move_index >= len(frame.moves):
+                    # All moves searched (or cut off): store result in transposition table
+                    score = frame.best_score
+                    frame.moves = None
+                    self._store_transposition_simple(frame.board_hash, frame.depth, score)
+                    sp -= 1
+                    continue
                 
                 # Calculate Late Move Reduction amount
-                reduction = self._calculate_lmr_reduction(move_index, depth, is_dangerous)
+                reduction = self._calculate_lmr_reduction(frame.move_index, frame.depth, is_dangerous)
                 # Ensure depth always decreases by at least 1
-                search_depth = max(0, depth - 1 - reduction)
-                
-                move_info = board.make_move_fast(piece, move)
-                try:
-                    # BLACK's turn (minimizing): after move, WHITE responds (maximizing)
-                    eval_score = self._minimax(board, search_depth, alpha, beta, True, allow_null=True, extension_count=extension_count)
-                    
-                    # Hanging pieces are already evaluated in Evaluation.evaluate()
-                    
-                    # LMR Re-search: Only if we got a really good score and used reduction
-                    if reduction > 0 and eval_score < beta and search_depth < depth - 1:
-                        # Re-search at full depth if the reduced search found a good move
-                        full_eval_score = self._minimax(board, depth - 1, alpha, beta, True, allow_null=True)
-                        eval_score = full_eval_score
-                    
-                except TimeoutError:
-                    board.unmake_move_fast(piece, move, move_info)
-                    raise
-                board.unmake_move_fast(piece, move, move_info)
+                search_depth = max(0, frame.depth - 1 - reduction)
+                frame.move_index += 1
                 
-                # Update best score for minimizing player
-                if eval_score < best_score:
-                    best_score = eval_score
+                frame.move_info = board.make_move_fast(piece, move)
+                frame.piece = piece
+                frame.move = move
+                frame.reduction = reduction
+                frame.search_depth = search_depth
+                frame.state = _FRAME_CHILD
                 
-                # Alpha-beta pruning: update beta
-                if eval_score < beta:
-                    beta = eval_score
-                    
-                # Alpha cutoff: if alpha >= beta, prune remaining moves
-                if alpha >= beta:
-                    # Store killer move for non-captures
-                    if not move.is_capture():
-                        self._store_killer_move(move, depth)
-                    break  # Alpha cutoff
-        
-        # Store in transposition table
-        # Store result in transposition table
-        self._store_transposition_simple(board_hash, depth, best_score)
-        return best_score
-    
-    def _hash_board_fast(self, board: Board) -> int:
-        """Ultra-fast board hash using bit operations."""
-        hash_val = 0
-        shift = 0
-        
-        # More efficient hashing using bit operations
-        for row in range(8):
-            for col in range(8):
-                square = board.squares[row][col]
-                if square.has_piece and square.piece:
-                    piece = square.piece
-                    # Combine piece type (3 bits) + color (1 bit) + position (6 bits) = 10 bits per piece
-                    piece_code = (1 if piece.name == 'pawn' else 
-                                2 if piece.name == 'knight' else 
-                                3 if piece.name == 'bishop' else 
-                                4 if piece.name == 'rook' else 
-                                5 if piece.name == 'queen' else 6)
-                    color_bit = 0 if piece.color == 'white' else 8
-                    position = row * 8 + col
-                    
-                    piece_hash = (piece_code | color_bit) << shift
-                    hash_val ^= piece_hash ^ (position << (shift + 4))
-                    shift = (shift + 10) % 64  # Rotate shift to spread bits
+                # After the move the opponent responds
+                entering = True
+                node_depth, node_alpha, node_beta = search_depth, frame.alpha, frame.beta
+                node_maximizing, node_allow_null, node_extension = not frame.maximizing, True, frame.extension_count
         
-        # Include turn with a simple bit flip
-        if board.next_player == 'black':
-            hash_val ^= 0x5555555555555555  # XOR with pattern
-            
-        return hash_val
+        except TimeoutError:
+            # Undo every move and null move that is still on the board
+            while sp >= 0:
+                frame = stack[sp]
+                if frame.state == _FRAME_NULL:
+                    self._unmake_null_move(board, frame.null_player)
+                elif frame.state in (_FRAME_CHILD, _FRAME_RESEARCH):
+                    board.unmake_move_fast(frame.piece, frame.move, frame.move_info)
+                frame.moves = None
+                sp -= 1
+            raise
     
-    def _store_transposition_simple(self, board_hash: int, depth: int, score: float, best_move: Optional[Move] = None):
+    def _store_transposition_simple(self, board_hash: int, depth: int, score: int, best_move: Optional[Move] = None):
         """Enhanced transposition table storage with mate support (Solution 4)."""
         # Re-enabled transposition table storage for performance
-        # Only store if table isn't too big
-        if len(self.transposition_table) < 50000:
+        # Only add new positions if the table isn't too big, and don't let a
+        # shallower result replace one from the current search
+        existing = self.transposition_table.get(board_hash)
+        if (existing is None and len(self.transposition_table) < TT_MAX_ENTRIES) or (
+                existing is not None and (existing['gen'] != self.tt_gen or existing['depth'] <= depth)):
             entry = {
                 'depth': depth,
                 'score': score,
-                'best_move': best_move
+                'best_move': best_move,
+                'gen': self.tt_gen
             }
             
             # SOLUTION 4: Enhanced transposition table with mate flags
@@ -612,8 +726,11 @@ class Search:
                     print(f"💾 CACHING MATE: {best_move.to_algebraic()} (mate in {mate_distance})")
             
             self.transposition_table[board_hash] = entry
+        
+        if self.shared_tt is not None:
+            self.shared_tt.store(board_hash, depth, score)
     
-    def _quiescence_search_simple(self, board: Board, alpha: float, beta: float, maximizing: bool, depth: int = 0) -> float:
+    def _quiescence_search_simple(self, board: Board, alpha: int, beta: int, maximizing: bool, depth: int = 0) -> int:
         """
         Proper quiescence search with recursion to handle capture sequences.
         This will catch defended pieces and recaptures.
@@ -697,20 +814,16 @@ class Search:
     
     def _get_capture_moves_simple(self, board: Board, color: str) -> list:
         """Get only capture moves for simple quiescence search."""
-        captures = []
-        moves = board.get_all_moves(color)
-        for piece, move in moves:
-            if move.captured is not None:
-                captures.append((piece, move))
-        return captures
+        return list(board.generate_captures(color))
     
-    def _store_transposition(self, board_hash: int, depth: int, score: float, entry_type: str):
+    def _store_transposition(self, board_hash: int, depth: int, score: int, entry_type: str):
         """Store position in transposition table."""
         # Simple replacement scheme - always replace
         self.transposition_table[board_hash] = {
             'depth': depth,
             'score': score,
-            'type': entry_type
+            'type': entry_type,
+            'gen': self.tt_gen
         }
         
         # Limit table size to prevent memory issues
@@ -720,68 +833,73 @@ class Search:
             for key in keys_to_remove:
                 del self.transposition_table[key]
     
-    def _get_ordered_moves(self, board: Board, color: str) -> List[Tuple[Piece, Move]]:
-        """FAST move ordering prioritizing checkmate, good captures and tactical moves."""
+    def _get_ordered_moves(self, board: Board, color: str, depth: int = 0) -> List[Tuple[Piece, Move]]:
+        """
+        FAST move ordering prioritizing checkmate, good captures and tactical moves.
+        Captures are ordered by MVV-LVA; at depth >= 3 captures that lose material
+        by SEE are demoted behind the quiet moves. At the frontier (depth 1) quiet
+        moves are ordered by a batched static evaluation of the resulting leaves.
+        """
         moves = board.get_all_moves(color)
         
         if not moves:
             return []
         
-        # Check for immediate checkmate moves first
-        checkmate_moves = []
-        captures = []
-        non_captures = []
+        # One integer sort key per move: the move class (checkmate, capture, quiet,
+        # losing capture) sits above ORDER_BUCKET and the score within the class below it
+        keys = []
+        frontier_slots = []
+        
+        # Frontier children are all leaves - collect their piece arrays and
+        # evaluate them in one kernel call instead of scoring moves one by one
+        frontier = depth == 1 and len(moves) <= LEAF_BATCH
+        leaf_buf = self._leaf_buf
+        opponent_color = 'black' if color == 'white' else 'white'
         
-        for piece, move in moves:
+        for index, (piece, move) in enumerate(moves):
             # Test if this move delivers checkmate
             move_info = board.make_move_fast(piece, move)
+            if frontier:
+                leaf_buf[index * 64:index * 64 + 64] = board.piece_arr
             try:
-                opponent_color = 'black' if color == 'white' else 'white'
                 if board.is_checkmate(opponent_color):
                     # This move delivers checkmate - highest priority!
-                    checkmate_moves.append((piece, move))
-                    board.unmake_move_fast(piece, move, move_info)
+                    # (the finally clause undoes the move)
+                    keys.append(ORDER_CHECKMATE)
                     continue
             finally:
                 board.unmake_move_fast(piece, move, move_info)
             
             # Not a checkmate move, categorize normally
             if move.captured:
-                # Quick SEE evaluation - only for clearly winning/losing captures
-                captured_value = self._get_piece_value(move.captured.name)
-                attacker_value = self._get_piece_value(piece.name)
+                # MVV-LVA: most valuable victim first, cheapest attacker breaks ties
+                victim_value = PIECE_VALUES[move.captured.code]
+                attacker_value = PIECE_VALUES[piece.code]
+                score = 10 * victim_value - attacker_value
                 
-                # Simple heuristic: if we're capturing something more valuable, prioritize
-                if captured_value >= attacker_value:
-                    score = captured_value * 10 + (1000 - attacker_value)  # MVV-LVA
-                    captures.append((score, piece, move))
+                # SEE only where it pays off: questionable captures near the root
+                if depth >= 3 and victim_value < attacker_value and SEE.evaluate_capture(board, move) < 0:
+                    keys.append(ORDER_LOSING_CAPTURE + score)
                 else:
-                    # For questionable captures, do proper SEE but cache results
-                    see_value = SEE.evaluate_capture(board, move)
-                    score = see_value + captured_value  # Combine SEE with capture value
-                    captures.append((score, piece, move))
+                    keys.append(ORDER_CAPTURE + score)
+            elif frontier:
+                # Scored below from the batched leaf evaluation
+                frontier_slots.append(index)
+                keys.append(ORDER_QUIET)
             else:
                 # Quick scoring for non-captures
-                score = self._score_quiet_move_fast(board, piece, move)
-                non_captures.append((score, piece, move))
-        
-        # Sort by score (best first)
-        captures.sort(reverse=True, key=lambda x: x[0])
-        non_captures.sort(reverse=True, key=lambda x: x[0])
-        
-        # Return checkmate moves first, then captures, then non-captures
-        result = []
-        # Checkmate moves have absolute priority
-        for piece, move in checkmate_moves:
-            result.append((piece, move))
-        # Then good captures
-        for _, piece, move in captures:
-            result.append((piece, move))
-        # Finally quiet moves
-        for _, piece, move in non_captures:
-            result.append((piece, move))
-        
-        return result
+                keys.append(ORDER_QUIET + self._score_quiet_move_fast(board, piece, move))
+        
+        if frontier_slots:
+            scores = self._leaf_scores
+            evaluate_batch(leaf_buf, len(moves), PIECE_SQUARE_BUFFER, scores)
+            sign = 1 if color == 'white' else -1  # Scores are from white's perspective
+            for index in frontier_slots:
+                keys[index] += sign * scores[index]
+        
+        # A single stable sort on the keys (best first) keeps equal moves in generation order
+        order = sorted(range(len(moves)), key=keys.__getitem__, reverse=True)
+        return [moves[index] for index in order]
     
     def _score_quiet_move_fast(self, board: Board, piece: Piece, move: Move) -> int:
         """Fast scoring for non-capture moves."""
@@ -793,13 +911,12 @@ class Search:
             score += 20
             
         # Castling bonus
-        if piece.name == 'king' and abs(move.final.col - move.initial.col) == 2:
+        if piece.code == KING and abs(move.final.col - move.initial.col) == 2:
             score += 50
             
         # Development bonus (only check if piece is on back rank)
-        if piece.name in ['knight', 'bishop']:
-            if (piece.color == 'white' and move.initial.row == 7) or \
-               (piece.color == 'black' and move.initial.row == 0):
+        if piece.code in _IS_MINOR:
+            if move.initial.row == (7 if piece.color_idx == 0 else 0):
                 score += 15
                 
         return score
@@ -813,183 +930,66 @@ class Search:
             score += 20
             
         # Development bonus for knights and bishops
-        if piece.name in ['knight', 'bishop']:
-            if (piece.color == 'white' and move.initial.row == 7) or \
-               (piece.color == 'black' and move.initial.row == 0):
+        if piece.code in _IS_MINOR:
+            if move.initial.row == (7 if piece.color_idx == 0 else 0):
                 score += 15
                 
         # Check for castling (king moving 2 squares)
-        if piece.name == 'king' and abs(move.final.col - move.initial.col) == 2:
+        if piece.code == KING and abs(move.final.col - move.initial.col) == 2:
             score += 50
             
         # Forward pawn moves
-        if piece.name == 'pawn':
-            direction = -1 if piece.color == 'white' else 1
-            if move.final.row == move.initial.row + direction:
-                score += 10
-                
-        return score
-        if piece.name in ['knight', 'bishop']:
-            if (piece.color == 'white' and move.initial.row == 7) or \
-               (piece.color == 'black' and move.initial.row == 0):
-                score += 15
-                
-        # Check for castling (king moving 2 squares)
-        if piece.name == 'king' and abs(move.final.col - move.initial.col) == 2:
-            score += 50
-            
-        # Forward pawn moves
-        if piece.name == 'pawn':
-            direction = -1 if piece.color == 'white' else 1
+        if piece.code == PAWN:
+            direction = -1 if piece.color_idx == 0 else 1
             if move.final.row == move.initial.row + direction:
                 score += 10
                 
         return score
     
-    def _is_tactical_move(self, board: Board, piece: Piece, move: Move) -> bool:
-        """Check if a move is tactical (checks, pins, discovered attacks, etc.)."""
-        # Make the move temporarily to check for tactics
-        move_info = board.make_move_fast(piece, move)
-        
-        try:
-            opponent_color = 'black' if piece.color == 'white' else 'white'
-            
-            # Check if move gives check
-            if board.in_check_king(opponent_color):
-                return True
-                
-            # Check if move creates a discovered attack
-            # (This is simplified - full implementation would be more complex)
-            
-            return False
-        finally:
-            board.unmake_move_fast(piece, move, move_info)
-    
-    def _score_tactical_move(self, board: Board, piece: Piece, move: Move) -> int:
-        """Score tactical moves."""
-        score = 0
-        
-        # Make the move temporarily to evaluate tactics
-        move_info = board.make_move_fast(piece, move)
-        
-        try:
-            opponent_color = 'black' if piece.color == 'white' else 'white'
-            
-            # Check bonus
-            if board.in_check_king(opponent_color):
-                score += 100
-                
-            # Future: Add bonuses for pins, forks, discovered attacks, etc.
-            
-        finally:
-            board.unmake_move_fast(piece, move, move_info)
-            
-        return score
-    
-    def _get_piece_value(self, piece_name: str) -> int:
-        """Fast piece value lookup."""
-        values = {'pawn': 100, 'knight': 300, 'bishop': 300, 'rook': 500, 'queen': 900, 'king': 10000}
-        return values.get(piece_name, 100)
-    
     def _is_center_square(self, row: int, col: int) -> bool:
         """Fast center square check."""
-        return 2 <= row <= 5 and 2 <= col <= 5
+        return bool((CENTER_SQUARES_MASK >> (row * 8 + col)) & 1)
     
     def _should_stop(self) -> bool:
-        """Check if search should be stopped due to time limit."""
-        return time.time() - self.start_time >= self.max_time
-        """Calculate a score for move ordering."""
-        score = 0.0
-        
-        # Captures: MVV-LVA (Most Valuable Victim - Least Valuable Attacker)
-        if move.is_capture() and move.captured:
-            from evaluation import Evaluation
-            victim_value = Evaluation.PIECE_VALUES.get(move.captured.name, 0)
-            attacker_value = Evaluation.PIECE_VALUES.get(piece.name, 0)
-            score += victim_value - (attacker_value / 10)  # Prefer low-value attackers
-        
-        # Promotions
-        if move.is_promotion():
-            score += 900  # High value for promotions
-        
-        # SAFETY CHECK: Heavily penalize moves that put pieces in danger
-        if self._move_puts_piece_in_danger(board, piece, move):
-            from evaluation import Evaluation
-            piece_value = Evaluation.PIECE_VALUES.get(piece.name, 0)
-            score -= piece_value * 0.9  # 90% penalty for dangerous moves
-        
-        # Center control bonus
-        if self._is_center_move(move):
-            score += 10
-        
-        # Castling bonus (check if king moves 2 squares)
-        if piece.name == 'king' and abs(move.final.col - move.initial.col) == 2:
-            score += 50
-        
-        # Penalty for moving to squares attacked by opponent pawns
-        if self._is_square_attacked_by_pawns(board, move.final, piece.color):
-            score -= 20
-        
-        return score
+        """
+        Check if search should be stopped due to time limit.
+        Called at every node, so only one call in 1024 actually reads the clock.
+        """
+        self._node_counter += 1
+        if self._node_counter & self._time_check_mask:
+            return False
+        return self._time_up()
     
-    def _is_center_move(self, move: Move) -> bool:
-        """Check if move goes to center squares."""
-        center_squares = [(3, 3), (3, 4), (4, 3), (4, 4)]
-        extended_center = [(2, 2), (2, 3), (2, 4), (2, 5), 
-                          (3, 2), (3, 5), (4, 2), (4, 5),
-                          (5, 2), (5, 3), (5, 4), (5, 5)]
-        
-        target = (move.final.row, move.final.col)
-        if target in center_squares:
+    def _time_up(self) -> bool:
+        """Ungated time limit check, also honouring the lazy SMP stop signal."""
+        if self.stop_event is not None and self.stop_event.is_set():
             return True
-        elif target in extended_center:
-            return True  # Lesser bonus for extended center
-        return False
+        return time.monotonic_ns() - self.start_time_ns >= self.max_time_ns
+    
+    def _is_center_move(self, move: Move) -> bool:
+        """Check if move goes to the center or extended center squares."""
+        return bool((CENTER_SQUARES_MASK >> (move.final.row * 8 + move.final.col)) & 1)
     
     def _is_square_attacked_by_pawns(self, board: Board, square, piece_color: str) -> bool:
         """Quick check if square is attacked by opponent pawns."""
-        row, col = square.row, square.col
-        opponent_color = 'black' if piece_color == 'white' else 'white'
-        
-        if opponent_color == 'white':
-            # White pawns attack from below
-            if row < 7:
-                for pawn_col in [col - 1, col + 1]:
-                    if 0 <= pawn_col < 8:
-                        pawn_square = board.squares[row + 1][pawn_col]
-                        if (pawn_square.has_piece and pawn_square.piece and 
-                            pawn_square.piece.name == 'pawn' and 
-                            pawn_square.piece.color == 'white'):
-                            return True
-        else:
-            # Black pawns attack from above  
-            if row > 0:
-                for pawn_col in [col - 1, col + 1]:
-                    if 0 <= pawn_col < 8:
-                        pawn_square = board.squares[row - 1][pawn_col]
-                        if (pawn_square.has_piece and pawn_square.piece and 
-                            pawn_square.piece.name == 'pawn' and 
-                            pawn_square.piece.color == 'black'):
-                            return True
-        return False
+        opponent = 1 if piece_color == 'white' else 0
+        return bool(board.bb[opponent][PAWN] & PAWN_ATTACKERS_OF[opponent][square.row * 8 + square.col])
     
-    def _is_killer_move(self, move: Move) -> bool:
-        """Check if move is a killer move (good non-capture move)."""
-        # Simple killer move implementation
-        move_key = f"{move.initial.row},{move.initial.col}-{move.final.row},{move.final.col}"
-        return move_key in self.killer_moves
+    def _is_killer_move(self, move: Move, depth: int) -> bool:
+        """Check if move is a killer move (good non-capture move) at this depth."""
+        return move.key in self.killer_moves.get(depth, ())
     
     def _store_killer_move(self, move: Move, depth: int):
         """Store a killer move for this depth."""
-        move_key = f"{move.initial.row},{move.initial.col}-{move.final.row},{move.final.col}"
-        if depth not in self.killer_moves:
-            self.killer_moves[depth] = []
+        killers = self.killer_moves.get(depth)
+        if killers is None:
+            killers = self.killer_moves[depth] = []
         
-        if move_key not in self.killer_moves[depth]:
-            self.killer_moves[depth].append(move_key)
+        if move.key not in killers:
+            killers.append(move.key)
             # Keep only best 2 killer moves per depth
-            if len(self.killer_moves[depth]) > 2:
-                self.killer_moves[depth].pop(0)
+            if len(killers) > 2:
+                killers.pop(0)
     
     def _is_castling(self, piece: Piece, move: Move) -> bool:
         """Check if move is castling."""
@@ -1005,8 +1005,6 @@ class Search:
     
     def _positional_move_value(self, board: Board, piece: Piece, move: Move) -> float:
         """Estimate positional value of a move."""
-        from evaluation import Evaluation
-        
         # Simple heuristic: difference in piece-square table values
         initial_value = Evaluation._get_piece_square_value(
             piece, move.initial.row, move.initial.col, 'middlegame'
@@ -1024,8 +1022,7 @@ class Search:
         if not move.is_capture() or not move.captured:
             return 0
         
-        from evaluation import Evaluation
-        victim_value = Evaluation.PIECE_VALUES.get(move.captured.name, 0)
+        victim_value = PIECE_VALUES[move.captured.code]
         
         # Bonus for capturing more valuable pieces
         # Could be enhanced with attacker piece value when available
@@ -1033,56 +1030,17 @@ class Search:
     
     def _get_tactical_moves(self, board: Board, color: str) -> List[Tuple[Piece, Move]]:
         """Get only tactical moves (captures, checks, promotions)."""
-        all_moves = board.get_all_moves(color)
-        tactical_moves = []
+        tactical_moves = list(board.generate_tactical(color))
+        forcing = {move.key for piece, move in tactical_moves}
         
-        for piece, move in all_moves:
-            if (move.is_capture() or move.is_promotion() or 
-                self._gives_check(board, piece, move)):
+        # Checks need the quiet moves - only test the ones not already listed
+        for piece, move in board.get_all_moves(color):
+            if move.key not in forcing and board.move_gives_check(piece, move):
                 tactical_moves.append((piece, move))
         
         return tactical_moves
     
-    def _gives_check(self, board: Board, piece: Piece, move: Move) -> bool:
-        """Check if a move gives check to the opponent."""
-        # Use fast make/unmake instead of expensive board copying
-        try:
-            move_info = board.make_move_fast(piece, move)
-            opponent_color = 'black' if piece.color == 'white' else 'white'
-            result = board.in_check_king(opponent_color)
-            board.unmake_move_fast(piece, move, move_info)
-        except TimeoutError:
-            board.unmake_move_fast(piece, move, move_info)
-            raise
-        return result
-            
-        return False
-    
-    def _is_square_attacked_by_major_pieces(self, board: Board, row: int, col: int, by_color: str) -> bool:
-        """Quick check if square is attacked by major pieces (queen, rook, bishop)."""
-        # Check for queen, rook, and bishop attacks only (faster than full search)
-        directions = [
-            (-1, 0), (1, 0), (0, -1), (0, 1),  # Rook/Queen directions
-            (-1, -1), (-1, 1), (1, -1), (1, 1)  # Bishop/Queen directions
-        ]
-        
-        for dr, dc in directions:
-            r, c = row + dr, col + dc
-            while 0 <= r < 8 and 0 <= c < 8:
-                square = board.squares[r][c]
-                if square.has_piece and square.piece:
-                    piece = square.piece
-                    if piece.color == by_color:
-                        # Check if this piece can attack the target square
-                        if ((piece.name in ['queen', 'rook'] and (dr == 0 or dc == 0)) or
-                            (piece.name in ['queen', 'bishop'] and dr != 0 and dc != 0)):
-                            return True
-                    break  # Piece blocks further attacks in this direction
-                r += dr
-                c += dc
-        return False
-    
-    def _quiescence_search(self, board: Board, alpha: float, beta: float, maximizing: bool, depth: int = 0) -> float:
+    def _quiescence_search(self, board: Board, alpha: int, beta: int, maximizing: bool, depth: int = 0) -> int:
         """
         Quiescence search to avoid horizon effect by searching all captures.
         This prevents the engine from missing tactical shots at the search frontier.
@@ -1135,26 +1093,13 @@ class Search:
     
     def _get_capture_moves(self, board: Board, color: str) -> list[tuple[Piece, Move]]:
         """Get only capture moves for quiescence search."""
-        captures = []
-        moves = board.get_all_moves(color)
-        for piece, move in moves:
-            if move.is_capture():
-                captures.append((piece, move))
-        return captures
+        return list(board.generate_captures(color))
     
     def _is_square_attacked_by_color(self, board: Board, row: int, col: int, by_color: str) -> bool:
         """Check if a square is attacked by any piece of the given color."""
-        for r in range(8):
-            for c in range(8):
-                square = board.squares[r][c]
-                if square.has_piece and square.piece and square.piece.color == by_color:
-                    attacking_piece = square.piece
-                    # Generate moves for this piece
-                    board.calc_moves(attacking_piece, r, c, filter_checks=False)
-                    for move in attacking_piece.moves:
-                        if move.final.row == row and move.final.col == col:
-                            return True
-        return False
+        occupied = board.occupancy[0] | board.occupancy[1]
+        side = 0 if by_color == 'white' else 1
+        return is_attacked(board.bb[side], side, row * 8 + col, occupied)
     
     def _is_square_defended_by_color(self, board: Board, row: int, col: int, by_color: str) -> bool:
         """Check if a square is defended by any piece of the given color."""
@@ -1165,21 +1110,8 @@ class Search:
         Detect endgame positions to avoid null move pruning in zugzwang positions.
         Simple heuristic: endgame if both sides have <= 13 points of material (excluding kings).
         """
-        white_material = black_material = 0
-        material_values = {'queen': 9, 'rook': 5, 'bishop': 3, 'knight': 3, 'pawn': 1}
-        
-        for row in range(8):
-            for col in range(8):
-                piece = board.squares[row][col].piece
-                if piece and piece.name != 'king':
-                    value = material_values.get(piece.name, 0)
-                    if piece.color == 'white':
-                        white_material += value
-                    else:
-                        black_material += value
-        
-        # Endgame if both sides have low material
-        return white_material <= 13 and black_material <= 13
+        # Material points are kept up to date by the board as pieces move
+        return board.material[0] <= 13 and board.material[1] <= 13
     
     def _is_dangerous_move(self, board: Board, piece: Piece, move: Move) -> bool:
         """
@@ -1194,16 +1126,16 @@ class Search:
         if hasattr(move, 'promotion') and move.promotion:
             return True
         
-        # Check if move gives check (requires temporary move)
-        if self._gives_check(board, piece, move):
+        # Check if move gives check (tested statically on the bitboards)
+        if board.move_gives_check(piece, move):
             return True
         
         # IMPORTANT: Don't reduce queen moves - they're often critical
-        if piece.name == 'queen':
+        if piece.code == QUEEN:
             return True
         
         # Don't reduce king moves - always critical for safety
-        if piece.name == 'king':
+        if piece.code == KING:
             return True
         
         # Check if it's a killer move (stored from previous searches)
@@ -1234,11 +1166,13 @@ class Search:
         """Make a null move (just switch the current player)."""
         original_player = board.next_player
         board.next_player = 'black' if board.next_player == 'white' else 'white'
+        board.position_history.append(board.position_key())
         return original_player
     
     def _unmake_null_move(self, board: Board, original_player: str) -> None:
         """Unmake a null move (restore the original player)."""
         board.next_player = original_player
+        board.position_history.pop()
     
     def _display_move_evaluations(self, move_evaluations: List[dict], current_player: str, best_move: Move):
         """Display enhanced evaluation breakdown for each move with complete transparency."""
@@ -1409,9 +1343,15 @@ class Search:
         current_square = board.squares[move.final.row][move.final.col]
         original_square = board.squares[original_row][original_col]
         
-        # Temporarily restore original position
+        # Temporarily restore original position (occupancy too - the line-of-sight tests read it)
         original_square.piece = piece
         current_square.piece = move.captured  # Restore captured piece if any
+        saved_occupancy = list(board.occupancy)
+        from_bit = 1 << (original_row * 8 + original_col)
+        to_bit = 1 << (move.final.row * 8 + move.final.col)
+        board.occupancy[piece.color_idx] = (saved_occupancy[piece.color_idx] | from_bit) & ~to_bit
+        if move.captured:
+            board.occupancy[move.captured.color_idx] |= to_bit
         
         # Check if piece was hanging in original position
         was_hanging = Evaluation._is_piece_hanging_at_position(board, piece, original_row, original_col)
@@ -1419,6 +1359,7 @@ class Search:
         # Restore current position
         current_square.piece = piece
         original_square.piece = None
+        board.occupancy[:] = saved_occupancy
         
         if not was_hanging:
             return 0.0  # Piece wasn't hanging originally, no rescue bonus
@@ -1428,7 +1369,7 @@ class Search:
         
         if is_now_safe:
             # Piece was successfully rescued!
-            piece_value = Evaluation.SEE_PIECE_VALUES.get(piece.name, 100)
+            piece_value = PIECE_VALUES[piece.code]
             base_rescue_bonus = piece_value * 0.4  # 40% of piece value as base rescue bonus
             
             # Apply depth-based multiplier - stronger influence at shallow depths (near root)
@@ -1482,10 +1423,7 @@ class Search:
         sequence = [first_move]
         
         # Make a copy of the board to explore the sequence
-        temp_board = Board()
-        temp_board.squares = [[sq for sq in row] for row in board.squares]
-        temp_board.next_player = board.next_player
-        temp_board.last_move = board.last_move
+        temp_board = board.copy()  # Piece array, bitboards and hash must match the squares
         
         # Try to play out the sequence
         current_color = color
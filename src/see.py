@@ -3,9 +3,66 @@ Static Exchange Evaluation (SEE) for chess.
 Calculates the material outcome of capture sequences on a given square.
 """
 
-from typing import List, Optional, Tuple
-from piece import Piece, Pawn, Knight, Bishop, Rook, Queen, King
-from evaluation import Evaluation
+from array import array
+from typing import Tuple
+from piece import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+from evaluation_numba import njit
+from bitboard import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKERS_OF, bishop_attacks, rook_attacks
+
+# Exchange values indexed by piece type (PAWN ... KING); the king's value doubles as its sentinel
+SEE_VALUES = (100, 320, 330, 500, 900, 20000)
+KING_VALUE = SEE_VALUES[KING]
+
+# No square can be attacked by more than 16 pieces of one color
+MAX_ATTACKERS = 16
+
+# Preallocated attacker value buffers reused by every evaluate_capture call
+_WHITE_VALUES = array('i', [0] * MAX_ATTACKERS)
+_BLACK_VALUES = array('i', [0] * MAX_ATTACKERS)
+
+
+@njit(cache=True, nogil=True)
+def _exchange_kernel(white_values, white_count, black_values, black_count,
+                     captured_value, moving_value, white_to_move):
+    """
+    Integer core of the exchange simulation over ascending attacker values.
+    Walks both lists with index pointers and returns the net material gain
+    from white's perspective.
+    """
+    balance = captured_value if white_to_move else -captured_value
+    current_value = moving_value
+    white_index = 0
+    black_index = 0
+    white_turn = not white_to_move
+
+    while True:
+        if white_turn:
+            if white_index >= white_count:
+                break
+            attacker_value = white_values[white_index]
+            white_index += 1
+            balance += current_value
+            current_value = attacker_value
+            # Don't capture with king if still under attack
+            if attacker_value == KING_VALUE and black_index < black_count:
+                break
+        else:
+            if black_index >= black_count:
+                break
+            attacker_value = black_values[black_index]
+            black_index += 1
+            balance -= current_value
+            current_value = attacker_value
+            if attacker_value == KING_VALUE and white_index < white_count:
+                break
+        white_turn = not white_turn
+
+    return balance
+
+
+# Compile the kernel at import instead of on the first capture searched
+_exchange_kernel(_WHITE_VALUES, 0, _BLACK_VALUES, 0, 0, 0, True)
+
 
 class SEE:
     """
@@ -28,193 +85,62 @@ class SEE:
         if not move.captured:
             return 0  # Not a capture
             
-        target_square = (move.final.row, move.final.col)
+        target = move.final.row * 8 + move.final.col
+        origin = move.initial.row * 8 + move.initial.col
         
         # Get the moving piece from the board
         moving_piece = board.squares[move.initial.row][move.initial.col].piece
         if not moving_piece:
             return 0  # No piece to move
         
-        # Get all attackers and defenders of the target square
-        white_attackers = SEE._get_attackers(board, target_square, 'white')
-        black_attackers = SEE._get_attackers(board, target_square, 'black')
-        
-        # Remove the moving piece from its respective attacker list
-        moving_piece_pos = (move.initial.row, move.initial.col, moving_piece.name)
-        if moving_piece.color == 'white':
-            white_attackers = [a for a in white_attackers if a != moving_piece_pos]
-        else:
-            black_attackers = [a for a in black_attackers if a != moving_piece_pos]
+        # Values of all attackers and defenders of the target square, minus the moving piece
+        white_count = SEE._fill_attacker_values(board, target, 0, origin, _WHITE_VALUES)
+        black_count = SEE._fill_attacker_values(board, target, 1, origin, _BLACK_VALUES)
         
         # Initial capture value
-        captured_value = Evaluation.PIECE_VALUES.get(move.captured.name, 0)
-        moving_piece_value = Evaluation.PIECE_VALUES.get(moving_piece.name, 0)
+        captured_value = SEE_VALUES[move.captured.code]
+        moving_piece_value = SEE_VALUES[moving_piece.code]
         
         # Simulate the exchange sequence
-        return SEE._simulate_exchange(
-            white_attackers, black_attackers, 
+        return _exchange_kernel(
+            _WHITE_VALUES, white_count, _BLACK_VALUES, black_count,
             captured_value, moving_piece_value,
             moving_piece.color == 'white'
         )
     
     @staticmethod
-    def _get_attackers(board, square: Tuple[int, int], color: str) -> List[Tuple[int, int, str]]:
+    def _attacker_masks(board, sq: int, side: int) -> Tuple[Tuple[int, int], ...]:
         """
-        Get all pieces of given color that can attack the target square.
-        
-        Returns:
-            List of (row, col, piece_name) tuples sorted by piece value (lowest first)
+        Bitboards of the pieces of one side (0 = white) attacking square sq,
+        as (piece_type, bitboard) pairs from the least valuable type up.
         """
-        attackers = []
-        target_row, target_col = square
-        
-        for row in range(8):
-            for col in range(8):
-                piece = board.squares[row][col].piece
-                if not piece or piece.color != color:
-                    continue
-                    
-                if SEE._can_attack_square(board, piece, row, col, target_row, target_col):
-                    attackers.append((row, col, piece.name))
-        
-        # Sort by piece value (use least valuable pieces first)
-        attackers.sort(key=lambda x: Evaluation.PIECE_VALUES.get(x[2], 0))
-        return attackers
-    
-    @staticmethod
-    def _can_attack_square(board, piece: Piece, from_row: int, from_col: int, 
-                          to_row: int, to_col: int) -> bool:
-        """
-        Check if a piece can attack a given square.
-        FIXED: Properly handles all piece types and path checking.
-        """
-        if from_row == to_row and from_col == to_col:
-            return False
-            
-        piece_name = piece.name.lower()
-        
-        # Pawn attacks
-        if piece_name == 'pawn':
-            direction = -1 if piece.color == 'white' else 1
-            if (from_row + direction == to_row and 
-                abs(from_col - to_col) == 1):
-                return True
-                
-        # Knight attacks
-        elif piece_name == 'knight':
-            row_diff = abs(from_row - to_row)
-            col_diff = abs(from_col - to_col)
-            if (row_diff == 2 and col_diff == 1) or (row_diff == 1 and col_diff == 2):
-                return True
-                
-        # Bishop attacks (and queen diagonal)
-        elif piece_name == 'bishop' or (piece_name == 'queen' and abs(from_row - to_row) == abs(from_col - to_col)):
-            if abs(from_row - to_row) == abs(from_col - to_col):
-                return SEE._is_diagonal_clear(board, from_row, from_col, to_row, to_col)
-                    
-        # Rook attacks (and queen straight)
-        elif piece_name == 'rook' or (piece_name == 'queen' and (from_row == to_row or from_col == to_col)):
-            if from_row == to_row or from_col == to_col:
-                return SEE._is_line_clear(board, from_row, from_col, to_row, to_col)
-                    
-        # King attacks
-        elif piece_name == 'king':
-            if abs(from_row - to_row) <= 1 and abs(from_col - to_col) <= 1:
-                return True
-                
-        return False
-    
-    @staticmethod
-    def _is_line_clear(board, from_row: int, from_col: int, to_row: int, to_col: int) -> bool:
-        """Check if horizontal/vertical line is clear between two squares."""
-        if from_row == to_row:  # Horizontal
-            start_col = min(from_col, to_col) + 1
-            end_col = max(from_col, to_col)
-            for col in range(start_col, end_col):
-                if board.squares[from_row][col].has_piece:
-                    return False
-        else:  # Vertical
-            start_row = min(from_row, to_row) + 1
-            end_row = max(from_row, to_row)
-            for row in range(start_row, end_row):
-                if board.squares[row][from_col].has_piece:
-                    return False
-        return True
-    
-    @staticmethod
-    def _is_diagonal_clear(board, from_row: int, from_col: int, to_row: int, to_col: int) -> bool:
-        """Check if diagonal line is clear between two squares."""
-        row_step = 1 if to_row > from_row else -1
-        col_step = 1 if to_col > from_col else -1
-        
-        current_row = from_row + row_step
-        current_col = from_col + col_step
-        
-        while current_row != to_row and current_col != to_col:
-            if board.squares[current_row][current_col].has_piece:
-                return False
-            current_row += row_step
-            current_col += col_step
-            
-        return True
+        pieces = board.bb[side]
+        occupied = board.occupancy[0] | board.occupancy[1]
+        diagonal = bishop_attacks(sq, occupied)
+        straight = rook_attacks(sq, occupied)
+        return (
+            (PAWN, pieces[PAWN] & PAWN_ATTACKERS_OF[side][sq]),
+            (KNIGHT, pieces[KNIGHT] & KNIGHT_ATTACKS[sq]),
+            (BISHOP, pieces[BISHOP] & diagonal),
+            (ROOK, pieces[ROOK] & straight),
+            (QUEEN, pieces[QUEEN] & (diagonal | straight)),
+            (KING, pieces[KING] & KING_ATTACKS[sq]),
+        )
     
     @staticmethod
-    def _simulate_exchange(white_attackers: List, black_attackers: List, 
-                          captured_value: int, moving_piece_value: int, 
-                          white_to_move: bool) -> int:
+    def _fill_attacker_values(board, sq: int, side: int, exclude: int, out) -> int:
         """
-        Simulate the exchange sequence and return net material gain.
-        
-        Args:
-            white_attackers: List of white attacking pieces
-            black_attackers: List of black attacking pieces  
-            captured_value: Value of initially captured piece
-            moving_piece_value: Value of piece making initial capture
-            white_to_move: True if white made the initial capture
-            
-        Returns:
-            Net material gain from white's perspective
+        Write the values of one side's attackers of sq into out in ascending order,
+        skipping the piece on square exclude. Returns the number of values written.
         """
-        # Copy the attacker lists so we can modify them
-        white_list = white_attackers.copy()
-        black_list = black_attackers.copy()
-        
-        # Material balance from white's perspective
-        material_balance = captured_value if white_to_move else -captured_value
-        current_piece_value = moving_piece_value
-        is_white_turn = not white_to_move  # Next move is opponent's
-        
-        # Simulate exchanges until no more attackers or king would be captured
-        while True:
-            if is_white_turn:
-                if not white_list:
-                    break
-                # White recaptures
-                attacker = white_list.pop(0)  # Use least valuable
-                attacker_value = Evaluation.PIECE_VALUES.get(attacker[2], 0)
-                material_balance += current_piece_value
-                current_piece_value = attacker_value
-                
-                # Don't capture with king if still under attack
-                if attacker[2] == 'king' and black_list:
-                    break
-                    
-            else:
-                if not black_list:
-                    break
-                # Black recaptures
-                attacker = black_list.pop(0)  # Use least valuable
-                attacker_value = Evaluation.PIECE_VALUES.get(attacker[2], 0)
-                material_balance -= current_piece_value
-                current_piece_value = attacker_value
-                
-                # Don't capture with king if still under attack
-                if attacker[2] == 'king' and white_list:
-                    break
-            
-            is_white_turn = not is_white_turn
-        
-        return material_balance
+        count = 0
+        for piece_type, attackers in SEE._attacker_masks(board, sq, side):
+            attackers &= ~(1 << exclude)
+            while attackers:
+                out[count] = SEE_VALUES[piece_type]
+                count += 1
+                attackers &= attackers - 1
+        return count
     
     @staticmethod
     def is_good_capture(board, move) -> bool:
@@ -1,4 +1,20 @@
-from typing import Optional, Any
+from __future__ import annotations
+
+from typing import Callable, ClassVar, Optional, Protocol
+
+
+class PieceLike(Protocol):
+    """What a square needs from the piece on it (piece.py imports this module, not the reverse)."""
+    color: str  # 'white' or 'black'
+
+
+# (row, col) of every square index, so unpacking an index never builds a new tuple
+SQUARE_COORDS: tuple[tuple[int, int], ...] = tuple((sq >> 3, sq & 7) for sq in range(64))
+
+
+# Algebraic file letters (a-h) indexed by column
+ALPHACOLS: tuple[str, ...] = ('a', 'b', 'c', 'd', 'e', 'f', 'g', 'h')
+get_alphacol = ALPHACOLS.__getitem__  # Column index -> file letter
 
 
 class Square:
@@ -8,20 +24,31 @@ class Square:
     Provides utilities for checking piece occupancy and converting to algebraic notation.
     """
     
-    # Mapping from column indices to algebraic notation (a-h)
-    ALPHACOLS: dict[int, str] = {i: chr(ord('a') + i) for i in range(8)}
+    __slots__ = ('row', 'col', 'piece', '_key')
+
+    ALPHACOLS: ClassVar[tuple[str, ...]] = ALPHACOLS  # Kept on the class for existing callers
 
-    def __init__(self, row: int, col: int, piece: Optional[Any] = None):
+    def __init__(self, row: int, col: int, piece: Optional[PieceLike] = None):
         self.row: int = row          # Row index (0-7, where 0 is rank 8)
         self.col: int = col          # Column index (0-7, where 0 is file a)
-        self.piece: Optional[Any] = piece  # Piece on this square (if any)
-        self.alphacol: str = self.ALPHACOLS[col]  # File letter (a-h)
+        self.piece: Optional[PieceLike] = piece  # Piece on this square (if any)
+        self._key: int = row * 8 + col  # Packed square index, used for equality and hashing
 
     def __eq__(self, other: object) -> bool:
         """Two squares are equal if they have the same coordinates."""
-        if not isinstance(other, Square):
+        try:
+            return self._key == other._key  # type: ignore[attr-defined]
+        except AttributeError:
             return NotImplemented
-        return self.row == other.row and self.col == other.col
+
+    def __hash__(self) -> int:
+        """Squares hash as their packed row * 8 + col index."""
+        return self._key
+
+    @property
+    def alphacol(self) -> str:
+        """File letter (a-h) of this square, derived from the column on demand."""
+        return ALPHACOLS[self.col]
 
     @property
     def has_piece(self) -> bool:
@@ -41,16 +68,24 @@ class Square:
         """Check if this square contains an enemy piece (opposite color)."""
         return self.piece is not None and self.piece.color != color
 
-    def is_empty_or_enemy(self, color: str) -> bool:
-        """Check if this square is empty or contains an enemy piece (valid move target)."""
-        return self.is_empty or self.has_enemy_piece(color)
-
     @staticmethod
     def in_range(*args: int) -> bool:
         """Check if all given coordinates are within the board (0-7)."""
-        return all(0 <= arg <= 7 for arg in args)
+        # arg | (7 - arg) only goes negative when arg is off the board on either side
+        acc = 0
+        for arg in args:
+            acc |= arg | (7 - arg)
+        return acc >= 0
+
+    @staticmethod
+    def in_range_rc(r: int, c: int) -> bool:
+        """Two-coordinate in_range for the common (row, col) case, without the loop."""
+        return (r | c | (7 - r) | (7 - c)) >= 0
+
+    # Convert column index to algebraic file letter (0->a, 1->b, etc.) - a bound C method, no dispatch
+    get_alphacol: ClassVar[Callable[[int], str]] = staticmethod(ALPHACOLS.__getitem__)
+
 
-    @classmethod
-    def get_alphacol(cls, col: int) -> str:
-        """Convert column index to algebraic file letter (0->a, 1->b, etc.)."""
-        return cls.ALPHACOLS[col]
+# One piece-less Square per coordinate, shared by every move's endpoints. They are never
+# mutated; a board's own grid still builds its squares since pieces are placed on them in place.
+EMPTY_SQUARES: tuple[tuple[Square, ...], ...] = tuple(tuple(Square(row, col) for col in range(8)) for row in range(8))
@@ -1,17 +1,55 @@
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
 from color import Color
 
+RGB = Tuple[int, int, int]
+
+# Slots of Theme.palette: field + shade, with shade 0 = light and 1 = dark
+BG, TRACE, MOVES, SELECTED = 0, 2, 4, 6
+
+@dataclass(frozen=True, slots=True, kw_only=True)
 class Theme:
-    
-    def __init__(self, light_bg, dark_bg, 
-                 light_trace, dark_trace, 
-                 light_moves, dark_moves,
-                 light_selected, dark_selected,
-                 move_highlight,
-                 name=None):  # Add name for theme
-        self.bg = Color(light_bg, dark_bg)
-        self.trace = Color(light_trace, dark_trace)
-        self.moves = Color(light_moves, dark_moves)
-        self.selected = Color(light_selected, dark_selected)
-        self.move_highlight = move_highlight
-        self.name = name  # Store the theme name
+    """
+    Immutable board color scheme. Themes are built once and shared by reference,
+    so every field is a plain RGB tuple; Color pairs are only made on request.
+    """
+
+    light_bg: RGB
+    dark_bg: RGB
+    light_trace: RGB
+    dark_trace: RGB
+    light_moves: RGB
+    dark_moves: RGB
+    light_selected: RGB
+    dark_selected: RGB
+    move_highlight: RGB
+    name: Optional[str] = None  # Theme identifier (also picks the piece texture set)
+    # All square shades in one flat tuple, indexed by BG/TRACE/MOVES/SELECTED + shade
+    palette: Tuple[RGB, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'palette', (self.light_bg, self.dark_bg,
+                                             self.light_trace, self.dark_trace,
+                                             self.light_moves, self.dark_moves,
+                                             self.light_selected, self.dark_selected))
+
+    @property
+    def bg(self):
+        """Board square colors as a light/dark Color pair."""
+        return Color(self.light_bg, self.dark_bg)
+
+    @property
+    def trace(self):
+        """Last move highlight colors as a light/dark Color pair."""
+        return Color(self.light_trace, self.dark_trace)
+
+    @property
+    def moves(self):
+        """Valid move highlight colors as a light/dark Color pair."""
+        return Color(self.light_moves, self.dark_moves)
 
+    @property
+    def selected(self):
+        """Selected square colors as a light/dark Color pair."""
+        return Color(self.light_selected, self.dark_selected)
@@ -0,0 +1,18 @@
+"""
+Zobrist keys for incremental position hashing.
+The board XORs one key per (piece code, square) into board.zobrist as pieces
+move, plus a side-to-move key when the positions are recorded for repetition.
+"""
+
+import random
+from array import array
+
+# Fixed seed so keys (and therefore position hashes) are reproducible between runs
+_rng = random.Random(0x5EED_C4E55)
+
+# Keys indexed by (piece code + 6) * 64 + square; the empty-square row (code 0) is all zeros
+ZOBRIST_KEYS = array('Q', [0 if code == 0 else _rng.getrandbits(64)
+                           for code in range(-6, 7) for _ in range(64)])
+
+# XORed into recorded positions when black is to move
+ZOBRIST_BLACK_TO_MOVE = _rng.getrandbits(64)